@@ -0,0 +1,88 @@
+import sys
+import argparse
+import textwrap
+import numpy as np
+import player_types
+from game import Game
+from board import Board
+from perfect_player import PerfectPlayer
+from state_tables import DIGITS, LEGAL_MOVES, MOVE_DELTAS, WINNERS
+
+NUM_PIECES = (DIGITS != 0).sum(axis=1)
+POSITIONS = np.arange(9)
+
+# Audits learned players against the solved game. Every reachable position where the player is
+# to move is checked, each counting the same, and the player's greedy choice is compared with
+# the optimal moves. A choice is suboptimal if it is not one of the best moves, and an error if
+# it also changes the outcome, e.g. from a win to a draw. Tied greedy moves are weighted
+# equally, since the player picks one of them at random.
+class OptimalityAuditor(Game):
+    def __init__(self, args):
+        parsed_args = self._parse_args(args)
+        self.player1 = self.get_and_load_player(parsed_args.learning_type, Board.X)
+        self.player2 = self.get_and_load_player(parsed_args.learning_type, Board.O)
+
+    def _parse_args(self, args):
+        parser = argparse.ArgumentParser(
+            description="Audit Machine Learning Tic-Tac-Toe Players against perfect play",
+            formatter_class=argparse.RawTextHelpFormatter,
+            epilog=textwrap.dedent("where LEARNING_TYPE is as follows:\n" +
+                                   player_types.get_learning_player_command_line_args()))
+        parser.add_argument(
+            "-l", "--learning-type", choices=player_types.get_learning_player_types(),
+            default="TD", dest="learning_type", metavar="LEARNING_TYPE")
+        return parser.parse_args(args)
+
+    def audit(self):
+        return {Board.X: audit_player(self.player1), Board.O: audit_player(self.player2)}
+
+    def show_results(self, results):
+        for piece in [Board.X, Board.O]:
+            print("{} Results:".format(Board.format_piece(piece)))
+            for ply, ply_results in results[piece].items():
+                label = "All" if ply is None else "Ply {}".format(ply)
+                print("- {}: {} positions, {:.2f}% suboptimal, {:.2f}% errors".format(
+                    label, ply_results["num_positions"], 100.0*ply_results["suboptimal"],
+                    100.0*ply_results["errors"]))
+
+# Returns the suboptimal and error rates by ply, the number of pieces on the board, with the
+# totals under None
+def audit_player(player):
+    best_move_masks = PerfectPlayer.get_best_move_array()
+    to_move = NUM_PIECES % 2 == (0 if player.piece == Board.X else 1)
+    states = np.flatnonzero((best_move_masks != 0) & to_move)
+    next_states = states[:, np.newaxis] + MOVE_DELTAS[player.piece]*LEGAL_MOVES[states]
+    move_values = player.get_state_move_values(states)
+    greedy = move_values == move_values.max(axis=1, keepdims=True)
+    optimal = (best_move_masks[states][:, np.newaxis] >> POSITIONS) & 1 == 1
+    same_outcome = np.sign(_get_move_scores(player.piece, next_states)) == \
+        np.sign(PerfectPlayer.get_score_array()[states])[:, np.newaxis]
+    num_greedy = greedy.sum(axis=1)
+    suboptimal = (greedy & ~optimal).sum(axis=1)/num_greedy
+    errors = (greedy & ~same_outcome).sum(axis=1)/num_greedy
+
+    plies = NUM_PIECES[states]
+    results = {}
+    for ply in np.unique(plies).tolist() + [None]:
+        selected = np.ones(len(states), dtype=bool) if ply is None else plies == ply
+        results[ply] = {"num_positions": int(selected.sum()),
+                        "suboptimal": float(suboptimal[selected].mean()),
+                        "errors": float(errors[selected].mean())}
+    return results
+
+# The scores of the afterstates from the point of view of the player that moved, as in the
+# solved tables
+def _get_move_scores(piece, next_states):
+    winners = WINNERS[next_states]
+    move_scores = -PerfectPlayer.get_score_array()[next_states].astype(np.int64)
+    move_scores[winners == piece] = 10 - NUM_PIECES[next_states][winners == piece]
+    move_scores[winners == Board.DRAW] = 0
+    return move_scores
+
+def main(args=sys.argv[1:]):
+    auditor = OptimalityAuditor(args)
+    auditor.show_results(auditor.audit())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
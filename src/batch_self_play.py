@@ -0,0 +1,115 @@
+import numpy as np
+from board import Board
+from learning_computer_player import LearningComputerPlayer
+from perfect_player import PerfectPlayer
+from q_learning_player import QLearningPlayer
+from state_tables import LEGAL_MOVES, MOVE_DELTAS, WINNERS
+
+# Plays many games in lockstep with NumPy arrays instead of one GameController per game.
+# Learning players must use dense values, a PerfectPlayer plays one of its best moves and any
+# other player plays randomly. Updates that several games in one batch make to the same state
+# are averaged.
+class BatchSelfPlay(object):
+    def __init__(self, x_player, o_player, seed=None):
+        self.players = [x_player, o_player]
+        self.random = np.random.default_rng(seed)
+        for player, piece in zip(self.players, [Board.X, Board.O]):
+            player.set_piece(piece)
+
+    def play(self, num_games):
+        states = np.zeros(num_games, dtype=np.int64)
+        winners = np.zeros(num_games, dtype=np.int8)
+        history = np.zeros((num_games, 9), dtype=np.int64)
+        moves = np.zeros((num_games, 9), dtype=np.int64)
+        num_moves = np.zeros(num_games, dtype=np.int64)
+        for move_number in range(9):
+            active = np.flatnonzero(winners == Board.EMPTY)
+            player = self.players[move_number % 2]
+            positions = self._choose_moves(player, states[active])
+            states[active] += MOVE_DELTAS[player.piece][positions]
+            winners[active] = WINNERS[states[active]]
+            history[active, move_number] = states[active]
+            moves[active, move_number] = positions
+            num_moves[active] += 1
+
+        for player in self.players:
+            if isinstance(player, QLearningPlayer) and player.learning:
+                self._set_q_rewards(player, history, moves, num_moves, winners)
+            elif self._is_learner(player) and player.learning:
+                self._set_rewards(player, history, num_moves, winners)
+        return winners
+
+    def _is_learner(self, player):
+        return isinstance(player, LearningComputerPlayer)
+
+    def _choose_moves(self, player, states):
+        if isinstance(player, PerfectPlayer):
+            best_move_masks = player.get_best_move_array()[states]
+            return self._choose_random((best_move_masks[:, np.newaxis] >> np.arange(9)) & 1)
+
+        random_moves = self._choose_random(LEGAL_MOVES[states])
+        if not self._is_learner(player):
+            return random_moves
+
+        move_values = player.get_state_move_values(states)
+        best_moves = self._choose_random(move_values == move_values.max(axis=1, keepdims=True))
+        if not player.learning:
+            return best_moves
+
+        explore = self.random.random(len(states)) < player.epsilon
+        return np.where(explore, random_moves, best_moves)
+
+    def _choose_random(self, choices):
+        return (self.random.random(choices.shape)*choices).argmax(axis=1)
+
+    def _set_rewards(self, player, history, num_moves, winners):
+        games = np.arange(len(winners))
+        last_states = history[games, num_moves - 1]
+        last_values = player.get_values(last_states)
+        self._store_values(player, last_states, last_values)
+        for move_number in reversed(range(8)):
+            active = np.flatnonzero(num_moves - 1 > move_number)
+            states = history[active, move_number]
+            current_values = player.get_values(states)
+            stored_states = player.get_stored_states(states)
+            alphas = player.get_alpha(stored_states, self._add_visits(player, stored_states))
+            current_values += alphas*(last_values[active] - current_values)
+            self._store_values(player, states, current_values)
+            last_values[active] = player.get_next_target(last_values[active], current_values)
+
+    # Visits are counted before the step sizes are, as in TDLearningPlayer.set_reward. Returns
+    # how many games make each game's update, by default to its state, since those are averaged.
+    def _add_visits(self, player, stored_states, updates=None):
+        _, indices, counts = np.unique(stored_states if updates is None else updates,
+                                       return_inverse=True, return_counts=True)
+        player.add_visits(stored_states)
+        return counts[indices]
+
+    def _store_values(self, player, states, values):
+        stored_states, indices = np.unique(player.get_stored_states(states), return_inverse=True)
+        totals = np.bincount(indices, weights=values, minlength=len(stored_states))
+        counts = np.bincount(indices, minlength=len(stored_states))
+        player.values.array[stored_states] = totals/counts
+
+    # Each game's own moves are updated from last to first, as in QLearningPlayer.set_reward
+    def _set_q_rewards(self, player, history, moves, num_moves, winners):
+        targets = np.where(winners == player.piece, 1.0, 0.0)
+        targets[winners == Board.DRAW] = player.draw_rewards[player.piece]
+        first_move_number = 0 if player.piece == Board.X else 1
+        for move_number in reversed(range(first_move_number, 9, 2)):
+            active = np.flatnonzero(num_moves > move_number)
+            states = history[active, move_number - 1] if move_number > 0 else np.zeros(len(active), dtype=np.int64)
+            positions = moves[active, move_number]
+            current_values = player.get_state_move_values(states)[np.arange(len(active)), positions]
+            alphas = player.get_alpha((states, positions),
+                                      self._add_visits(player, (states, positions), states*9 + positions))
+            current_values += alphas*(targets[active] - current_values)
+            self._store_q_values(player, states, positions, current_values)
+            targets[active] = player.get_next_target(
+                targets[active], player.get_state_move_values(states).max(axis=1))
+
+    def _store_q_values(self, player, states, positions, values):
+        pairs, indices = np.unique(states*9 + positions, return_inverse=True)
+        totals = np.bincount(indices, weights=values, minlength=len(pairs))
+        counts = np.bincount(indices, minlength=len(pairs))
+        player.values.array[pairs // 9, pairs % 9] = totals/counts
@@ -1,5 +1,11 @@
 from contextlib import contextmanager
 
+def _get_cell_lines(lines):
+    return tuple(tuple(index for index, line in enumerate(lines) if position in line) for position in range(9))
+
+def _get_cell_line_masks(cell_lines, masks):
+    return tuple(tuple((1 << index, masks[index]) for index in lines) for lines in cell_lines)
+
 class Board(object):
     EMPTY = 0
     X = 1
@@ -7,40 +13,160 @@ class Board(object):
     DRAW = 2
     PIECE_DICT = {X: "X", O: "O"}
     WINNER_DICT = {X: "X Wins", O: "O Wins", DRAW: "Draw"}
+    WINNING_LINES = ((0,1,2), (3,4,5), (6,7,8), (0,3,6), (1,4,7), (2,5,8), (0,4,8), (2,4,6))
+    WINNING_MASKS = tuple(sum(1 << position for position in line) for line in WINNING_LINES)
+    CELL_LINES = _get_cell_lines(WINNING_LINES)
+    CELL_LINE_MASKS = _get_cell_line_masks(CELL_LINES, WINNING_MASKS)
+    CELL_OTHER_LINES_MASKS = tuple(~sum(1 << index for index in lines) for lines in CELL_LINES)
+    UNKNOWN = object()
+    NUM_STATES = 3**9
+    CELL_WEIGHTS = tuple(3**position for position in range(9))
+    MOVE_DELTAS = {X: CELL_WEIGHTS, O: tuple(2*weight for weight in CELL_WEIGHTS)}
+    PIECE_DIGITS = {EMPTY: 0, X: 1, O: 2}
+    DIGIT_PIECES = (EMPTY, X, O)
+    __slots__ = ("x_bits", "o_bits", "num_empty", "key", "winning_lines", "_winner")
 
     def __init__(self):
-        self.state = [self.EMPTY]*9
+        self.reset()
+
+    def reset(self):
+        self.x_bits = 0
+        self.o_bits = 0
+        self.num_empty = 9
+        self.key = 0
+        self.winning_lines = 0
+        self._winner = None
+
+    @property
+    def state(self):
+        return [self.get_piece(position) for position in range(9)]
+
+    def get_piece(self, position):
+        mask = 1 << position
+        if self.x_bits & mask:
+            return self.X
+        if self.o_bits & mask:
+            return self.O
+        return self.EMPTY
 
     def is_valid_move(self, position):
-        return (position >= 0 and position <= 8 and self.state[position] == self.EMPTY and
+        return (position >= 0 and position <= 8 and not (self.x_bits | self.o_bits) & (1 << position) and
             self.get_winner() is None)
-    
+
     def make_move(self, position, piece):
-        self.state[position] = piece
-        
+        mask = 1 << position
+        weight = self.CELL_WEIGHTS[position]
+        if self.x_bits & mask:
+            self.x_bits &= ~mask
+            self.key -= weight
+            self.num_empty += 1
+        elif self.o_bits & mask:
+            self.o_bits &= ~mask
+            self.key -= 2*weight
+            self.num_empty += 1
+
+        # Only the lines through this position can start or stop being complete. The winner is
+        # worked out again from the complete lines the next time it is asked for.
+        self.winning_lines &= self.CELL_OTHER_LINES_MASKS[position]
+        self._winner = self.UNKNOWN
+        if piece == self.X:
+            self.x_bits |= mask
+            self.key += weight
+            self.num_empty -= 1
+            self._add_winning_lines(position, self.x_bits)
+        elif piece == self.O:
+            self.o_bits |= mask
+            self.key += 2*weight
+            self.num_empty -= 1
+            self._add_winning_lines(position, self.o_bits)
+
+    def _add_winning_lines(self, position, bits):
+        for line_mask, mask in self.CELL_LINE_MASKS[position]:
+            if bits & mask == mask:
+                self.winning_lines |= line_mask
+
+    def _get_winning_line(self):
+        # Lowest complete line, the first one a scan of WINNING_LINES would find
+        return (self.winning_lines & -self.winning_lines).bit_length() - 1
+
+    def _find_winner(self):
+        if self.winning_lines:
+            mask = self.WINNING_MASKS[self._get_winning_line()]
+            return self.X if self.x_bits & mask == mask else self.O
+
+        return self.DRAW if self.num_empty == 0 else None
+
+    # push_move and pop_move are a cheaper make_move for searching ahead. push_move only plays on
+    # an empty position and pop_move only takes back a move that push_move made.
+    def push_move(self, position, piece):
+        mask = 1 << position
+        if piece == self.X:
+            self.x_bits |= mask
+            bits = self.x_bits
+        else:
+            self.o_bits |= mask
+            bits = self.o_bits
+        self.key += self.MOVE_DELTAS[piece][position]
+        self.num_empty -= 1
+        self._add_winning_lines(position, bits)
+        self._winner = self.UNKNOWN
+        return self.get_winner(), self.key
+
+    def pop_move(self, position):
+        mask = 1 << position
+        if self.x_bits & mask:
+            self.x_bits ^= mask
+            self.key -= self.CELL_WEIGHTS[position]
+        else:
+            self.o_bits ^= mask
+            self.key -= 2*self.CELL_WEIGHTS[position]
+        self.num_empty += 1
+        self.winning_lines &= self.CELL_OTHER_LINES_MASKS[position]
+        self._winner = self.UNKNOWN
+
+    def get_winner_after_move(self, position, piece):
+        if self.winning_lines:
+            winner, _ = self.push_move(position, piece)
+            self.pop_move(position)
+            return winner
+
+        bits = (self.x_bits if piece == self.X else self.o_bits) | (1 << position)
+        for _, mask in self.CELL_LINE_MASKS[position]:
+            if bits & mask == mask:
+                return piece
+        return self.DRAW if self.num_empty == 1 else None
+
     @contextmanager
     def try_move(self, position, piece):
-        self.make_move(position, piece)
-        yield self.get_winner(), tuple(self.state)
-        self.make_move(position, self.EMPTY)
+        yield self.push_move(position, piece)
+        self.pop_move(position)
 
     def get_available_moves(self):
-        return list(filter(lambda position: self.state[position] == self.EMPTY, range(9)))
+        occupied = self.x_bits | self.o_bits
+        return [position for position in range(9) if not occupied & (1 << position)]
 
     def get_winning_positions(self):
-        for a,b,c in ((0,1,2), (3,4,5), (6,7,8), (0,3,6), (1,4,7), (2,5,8), (0,4,8), (2,4,6)):
-            if (self.state[a] != self.EMPTY and self.state[a] == self.state[b] and
-                self.state[a] == self.state[c]):
-                return [a,b,c]
+        if self.winning_lines:
+            return list(self.WINNING_LINES[self._get_winning_line()])
 
         return []
 
     def get_winner(self):
-        positions = self.get_winning_positions()
-        if positions:
-            return self.state[positions[0]]
+        if self._winner is self.UNKNOWN:
+            self._winner = self._find_winner()
+        return self._winner
+
+    @staticmethod
+    def encode_state(state):
+        return sum(Board.PIECE_DIGITS[piece]*weight for piece, weight in zip(state, Board.CELL_WEIGHTS))
 
-        return self.DRAW if self.state.count(self.EMPTY) == 0 else None
+    @staticmethod
+    def decode_state(key):
+        state = []
+        for _ in range(9):
+            key, digit = divmod(key, 3)
+            state.append(Board.DIGIT_PIECES[digit])
+        return tuple(state)
 
     @staticmethod
     def get_winner_text(winner):
@@ -63,7 +189,7 @@ class Board(object):
         return prefix + self._format_state(pos) + suffix
 
     def _format_state(self, pos):
-        return self.PIECE_DICT.get(self.state[pos], str(pos + 1))
+        return self.PIECE_DICT.get(self.get_piece(pos), str(pos + 1))
 
     @staticmethod
     def format_piece(piece):
@@ -2,20 +2,36 @@ import sys
 import argparse
 import textwrap
 import pickle
+import random
+import multiprocessing
+import numpy as np
+from collections import Counter
 import utils
 import player_types
 from game import Game
 from game_controller import GameController
 from board import Board
-from random_player import RandomPlayer
+
+def _compete_shard(competer, num_games, seed):
+    random.seed(int(seed.generate_state(1)[0]))
+    return competer._compete_games(num_games)
 
 class CompeteRandom(Game):
+    # Opponents that choose evenly among a fixed set of best moves, so every game against them
+    # can be enumerated with its probability. MCTS moves depend on its random playouts.
+    EXACT_OPPONENTS = ("Minimax", "Perfect", "Random")
+
     def __init__(self, args):
         parsed_args = self._parse_args(args)
         self.num_games = parsed_args.num_games
+        self.exact = parsed_args.exact
+        self.prefix_depth = parsed_args.prefix_depth
+        self.num_workers = parsed_args.workers
+        self.seed = parsed_args.seed
         self.player1 = self.get_and_load_player(parsed_args.learning_type, Board.X)
         self.player2 = self.get_and_load_player(parsed_args.learning_type, Board.O)
-        self.random_player = RandomPlayer()
+        self.opponent_type = parsed_args.opponent
+        self.opponent = player_types.get_player(parsed_args.opponent)
 
     def _parse_args(self, args):
         parser = argparse.ArgumentParser(
@@ -28,38 +44,116 @@ class CompeteRandom(Game):
         parser.add_argument(
             "-l", "--learning-type", choices=player_types.get_learning_player_types(),
             default="TD", dest="learning_type", metavar="LEARNING_TYPE")
-        return parser.parse_args(args)
+        parser.add_argument(
+            "-O", "--opponent", choices=player_types.get_opponent_types(), default="Random",
+            help="player to compete against")
+        parser.add_argument(
+            "-e", "--exact", action="store_true",
+            help="enumerate every game against the opponent with its probability instead of\n"
+                 "sampling games, for {} opponents".format(self._get_exact_opponent_names()))
+        parser.add_argument(
+            "-p", "--prefix-depth", default=2, type=int,
+            help="number of opening moves to group losing moves by")
+        parser.add_argument(
+            "-w", "--workers", default=1, type=int, help="number of worker processes to play games in")
+        parser.add_argument(
+            "-s", "--seed", type=int, help="random seed, for reproducible results")
+        parsed_args = parser.parse_args(args)
+        if parsed_args.workers < 1:
+            parser.error("--workers must be at least 1")
+        if parsed_args.exact and parsed_args.opponent not in self.EXACT_OPPONENTS:
+            parser.error("--exact can only enumerate games against {} opponents".format(
+                self._get_exact_opponent_names()))
+        return parsed_args
+
+    def _get_exact_opponent_names(self):
+        return ", ".join(self.EXACT_OPPONENTS[:-1]) + " or " + self.EXACT_OPPONENTS[-1]
 
     def compete(self):
+        return self._compete_exact() if self.exact else self._compete_sampled()
+
+    def _compete_sampled(self):
+        # Each shard of games gets its own seed, so results only depend on the seed and the
+        # number of workers, and the shards are merged in order no matter which finishes first
+        shards = utils.split_games(self.num_games, self.num_workers)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(shards))
+        if self.num_workers == 1:
+            return _compete_shard(self, shards[0], seeds[0])
+
         results = {Board.X: self._init_results(), Board.O: self._init_results()}
-        for game_number in range(self.num_games):
+        num_games_played = 0
+        with multiprocessing.Pool(self.num_workers) as pool:
+            tasks = [(self, num_games, seed) for num_games, seed in zip(shards, seeds)]
+            for num_games, shard_results in zip(shards, pool.starmap(_compete_shard, tasks)):
+                num_games_played += num_games
+                print("{} of {} games played".format(num_games_played, self.num_games))
+                self._merge_results(results, shard_results)
+        return results
+
+    def _merge_results(self, results, shard_results):
+        for piece in [Board.X, Board.O]:
+            results[piece]["num_losses"] += shard_results[piece]["num_losses"]
+            results[piece]["losing_moves"].update(shard_results[piece]["losing_moves"])
+
+    def _compete_games(self, num_games):
+        results = {Board.X: self._init_results(), Board.O: self._init_results()}
+        x_controller = GameController(self.player1, self.opponent)
+        o_controller = GameController(self.opponent, self.player2)
+        for game_number in range(num_games):
             self._show_progress(game_number+1)
-            self._compete_and_update_results(self.player1, self.random_player, results[Board.X], Board.O)
-            self._compete_and_update_results(self.random_player, self.player2, results[Board.O], Board.X)
+            self._compete_and_update_results(x_controller, results[Board.X], Board.O)
+            self._compete_and_update_results(o_controller, results[Board.O], Board.X)
         return results
 
     def _init_results(self):
-        return {"num_losses": 0, "losing_moves": []}
+        return {"num_losses": 0, "losing_moves": Counter()}
 
     def _show_progress(self, game_number):
-        if game_number % 1000 == 0:
+        if self.num_workers == 1 and game_number % 1000 == 0:
             print("{} of {} games played".format(game_number, self.num_games))
 
-    def _compete_and_update_results(self, player1, player2, results, opponent):
-        winner, moves = self._compete_game(player1, player2)
+    def _compete_and_update_results(self, controller, results, opponent):
+        winner, moves = self._compete_game(controller)
         if winner == opponent:
             results["num_losses"] += 1
-            if moves not in results["losing_moves"]:
-                results["losing_moves"].append(moves)
-
-    def _compete_game(self, player1, player2):
-        controller = GameController(player1, player2)
-        winner = None
-        moves = []
-        while winner is None:
-            winner, move = controller.make_move()
-            moves.append(move)
-        return winner, moves
+            results["losing_moves"][tuple(moves)] += 1
+
+    def _compete_game(self, controller):
+        controller.reset()
+        return controller.play_to_end()
+
+    def _compete_exact(self):
+        return {Board.X: self._get_exact_results(self.player1, Board.O),
+                Board.O: self._get_exact_results(self.player2, Board.X)}
+
+    def _get_exact_results(self, player, opponent):
+        results = self._init_exact_results()
+        board = Board()
+        player.set_board(board)
+        self.opponent.set_board(board)
+        self.opponent.set_piece(opponent)
+        self._enumerate_games(player, opponent, board, Board.X, 1.0, [], results)
+        return results
+
+    def _init_exact_results(self):
+        return {"probabilities": {Board.X: 0.0, Board.O: 0.0, Board.DRAW: 0.0}, "losing_moves": Counter()}
+
+    def _enumerate_games(self, player, opponent, board, piece, probability, moves, results):
+        # Every move the opponent could choose is equally likely
+        positions = player.get_best_moves() if piece == player.piece else self.opponent.get_best_moves()
+        probability /= len(positions)
+        for position in positions:
+            board.make_move(position, piece)
+            moves.append(position)
+            winner = board.get_winner()
+            if winner is None:
+                self._enumerate_games(player, opponent, board, -piece, probability, moves, results)
+            else:
+                results["probabilities"][winner] += probability
+                if winner == opponent:
+                    results["losing_moves"][tuple(moves)] += probability
+            moves.pop()
+            board.make_move(position, Board.EMPTY)
 
     def show_results(self, results):
         self._show_individual_results(results, Board.X)
@@ -67,17 +161,48 @@ class CompeteRandom(Game):
 
     def _show_individual_results(self, results, piece):
         print("{} Results:".format(Board.format_piece(piece)))
-        num_losses = results[piece]["num_losses"]
-        print("- Losses: {} ({}%)".format(num_losses, 100.0*num_losses/self.num_games))
+        if self.exact:
+            self._show_probabilities(results[piece]["probabilities"], piece)
+        else:
+            num_losses = results[piece]["num_losses"]
+            print("- Losses: {} ({}%)".format(num_losses, 100.0*num_losses/self.num_games))
 
-        losing_moves = sorted(results[piece]["losing_moves"])
+        losing_moves = results[piece]["losing_moves"]
         if losing_moves:
+            print("- Losing openings:")
+            losing_prefixes = self._get_losing_prefixes(losing_moves)
+            prefix_order = lambda moves: self._get_prefix_order(losing_prefixes, moves)
+            for moves in sorted(losing_prefixes, key=prefix_order):
+                self._show_losing_moves("- "*(len(moves) + 1), moves, losing_prefixes[moves])
+
             print("- Losing moves:")
-            for losing_moves in losing_moves:
-                print("- - {}".format(", ".join(map(str, losing_moves))))
+            for moves in sorted(losing_moves, key=lambda moves: (-losing_moves[moves], moves)):
+                self._show_losing_moves("- - ", moves, losing_moves[moves])
+
+    def _get_losing_prefixes(self, losing_moves):
+        losing_prefixes = Counter()
+        for moves, weight in losing_moves.items():
+            for length in range(1, min(self.prefix_depth, len(moves)) + 1):
+                losing_prefixes[moves[:length]] += weight
+        return losing_prefixes
+
+    def _get_prefix_order(self, losing_prefixes, moves):
+        # Depth first, with the openings that lose most first at each depth
+        return [(-losing_prefixes[moves[:length]], moves[length-1]) for length in range(1, len(moves) + 1)]
+
+    def _show_losing_moves(self, prefix, moves, weight):
+        weight = "{}%".format(100.0*weight) if self.exact else weight
+        print("{}{} ({})".format(prefix, ", ".join(map(str, moves)), weight))
+
+    def _show_probabilities(self, probabilities, piece):
+        print("- Wins: {}%".format(100.0*probabilities[piece]))
+        print("- Losses: {}%".format(100.0*probabilities[-piece]))
+        print("- Draws: {}%".format(100.0*probabilities[Board.DRAW]))
 
     def save_results(self, results):
-        with open(utils.get_path("data", self.player1.__class__.__name__ + "LosingResults.pkl"), "wb") as f:
+        suffix = "" if self.opponent_type == "Random" else "Vs" + self.opponent_type
+        file_name = self.player1.__class__.__name__ + "LosingResults" + suffix + ".pkl"
+        with open(utils.get_path("data", file_name), "wb") as f:
             pickle.dump(results, f)
 
 def main(args=sys.argv[1:]):
@@ -1,6 +1,8 @@
 from player import Player
 
 class ComputerPlayer(Player):
+    __slots__ = ()
+
     def indicate_move(self, position):
         return "My move is {}".format(position + 1)
 
@@ -12,8 +12,14 @@ class ConsoleGame(Game):
     ACTION_DIFF_PLAYERS = 3
     ACTION_QUIT = 4
 
+    def __init__(self):
+        self.controller = None
+
     def play_one_game(self, player1, player2):
-        self.controller = GameController(player1, player2)
+        if self.controller and self.controller.players == [player1, player2]:
+            self.controller.reset()
+        else:
+            self.controller = GameController(player1, player2)
         winner = None
         while winner is None:
             player = self.controller.get_player()
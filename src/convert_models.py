@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+import textwrap
+import player_types
+from board import Board
+
+class ModelConverter(object):
+    def __init__(self, args):
+        parsed_args = self._parse_args(args)
+        self.learning_types = parsed_args.learning_types or player_types.get_learning_player_types()
+
+    def _parse_args(self, args):
+        parser = argparse.ArgumentParser(
+            description="Convert pickled Machine Learning Tic-Tac-Toe models to model files",
+            formatter_class=argparse.RawTextHelpFormatter,
+            epilog=textwrap.dedent("where LEARNING_TYPE is as follows:\n" +
+                                   player_types.get_learning_player_command_line_args()))
+        parser.add_argument(
+            "-l", "--learning-type", choices=player_types.get_learning_player_types(), action="append",
+            dest="learning_types", metavar="LEARNING_TYPE", help="learning type to convert (default: all)")
+        return parser.parse_args(args)
+
+    def convert(self):
+        for learning_type in self.learning_types:
+            for piece in [Board.X, Board.O]:
+                self._convert_model(learning_type, piece)
+
+    def _convert_model(self, learning_type, piece):
+        player = player_types.get_learning_player(learning_type)
+        player.set_piece(piece)
+        legacy_filename = player._get_filename(".pkl")
+        if not os.path.exists(legacy_filename):
+            return
+
+        player.load_legacy(piece)
+        player.save()
+        print("Converted {} to {}".format(legacy_filename, player._get_filename()))
+
+def main(args=sys.argv[1:]):
+    converter = ModelConverter(args)
+    converter.convert()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,9 @@ from board import Board
 from learning_computer_player import run_if_learner
 
 class Game(object):
-    def get_and_load_player(self, player_type, piece):
+    def get_and_load_player(self, player_type, piece, shared=False):
         player = player_types.get_player(player_type)
-        run_if_learner(player, lambda: player.load(piece))
+        run_if_learner(player, lambda: player.load(piece, shared))
         return player
 
     def swap_players(self, player1, player2):
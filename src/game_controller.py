@@ -2,9 +2,17 @@ from board import Board
 from learning_computer_player import LearningComputerPlayer, run_if_learner
 
 class GameController(object):
+    __slots__ = ("players", "learners", "board", "player_number")
+
     def __init__(self, x_player, o_player):
         self.players = [x_player, o_player]
+        self.learners = [player for player in self.players if isinstance(player, LearningComputerPlayer)]
         self.board = Board()
+        self.reset()
+
+    # Starts a new game with the same players, reusing the board
+    def reset(self):
+        self.board.reset()
         self.player_number = 0
         for player, piece in zip(self.players, [Board.X, Board.O]):
             run_if_learner(player, lambda: player.reset())
@@ -20,3 +28,25 @@ class GameController(object):
         self.board.make_move(position, player.piece)
         self.player_number = 1 - self.player_number
         return self.board.get_winner(), position
+
+    # Plays the rest of the game without going through make_move for every move. With
+    # store_states, learning players store the state after each move as they do in training.
+    def play_to_end(self, store_states=False):
+        board = self.board
+        players = self.players
+        player_number = self.player_number
+        learners = self.learners if store_states else []
+        moves = []
+        winner = board.get_winner()
+        while winner is None:
+            player = players[player_number]
+            position = player.get_move()
+            board.make_move(position, player.piece)
+            moves.append(position)
+            for learner in learners:
+                learner.store_state()
+            winner = board.get_winner()
+            player_number = 1 - player_number
+
+        self.player_number = player_number
+        return winner, moves
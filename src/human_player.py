@@ -1,6 +1,8 @@
 from player import Player
 
 class HumanPlayer(Player):
+    __slots__ = ("interactive", "move")
+
     def __init__(self):
         super().__init__()
         self.set_interactive()
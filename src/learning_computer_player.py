@@ -1,10 +1,15 @@
 import pickle
 import os
 import utils
+import model_file
+from model_registry import registry
 from computer_player import ComputerPlayer
 from board import Board
 
 class LearningComputerPlayer(ComputerPlayer):
+    FILE_EXTENSION = ".model"
+    __slots__ = ("learning",)
+
     def __init__(self):
         super().__init__()
         self.set_params()
@@ -25,6 +30,9 @@ class LearningComputerPlayer(ComputerPlayer):
     def set_reward(self, winner):
         pass
 
+    def set_schedule_step(self, step):
+        pass
+
     def disable_learning(self):
         self.learning = False
 
@@ -34,29 +42,52 @@ class LearningComputerPlayer(ComputerPlayer):
     def get_move_values(self):
         pass
 
+    def get_best_moves(self):
+        max_value = -1
+        best_moves = []
+        for position, value in self.get_move_values().items():
+            if value > max_value:
+                max_value = value
+                best_moves = [position]
+            elif value == max_value:
+                best_moves.append(position)
+        return best_moves
+
     def get_num_states(self):
         pass
 
-    def load(self, piece):
+    def get_visit_stats(self):
+        return None
+
+    def load(self, piece, shared=False):
+        pass
+
+    def _load_file(self, piece, shared=False):
+        self.set_piece(piece)
+        filename = self._get_filename()
+        params, learned = registry.load(filename) if shared else model_file.load_model(filename)
+        self.set_params(**params)
+        return learned
+
+    def load_legacy(self, piece):
         pass
 
-    def _load_file(self, piece):
+    def _load_legacy_file(self, piece):
         self.set_piece(piece)
-        with open(self._get_filename(), "rb") as f:
+        with open(self._get_filename(".pkl"), "rb") as f:
             contents = pickle.load(f)
             self.set_params(**contents["params"])
             return contents["learned"]
 
-    def _get_filename(self):
-        filename = self.__class__.__name__ + Board.format_piece(self.piece) + ".pkl"
+    def _get_filename(self, extension=FILE_EXTENSION):
+        filename = self.__class__.__name__ + Board.format_piece(self.piece) + extension
         return utils.get_path("data", filename)
 
     def save(self):
         pass
 
     def _save_file(self, learned):
-        with open(self._get_filename(), "wb") as f:
-            return pickle.dump({"learned": learned, "params": self.get_params()}, f)
+        model_file.save_model(self._get_filename(), self.get_params(), learned)
 
 def run_if_learner(player, func):
     if isinstance(player, LearningComputerPlayer):
@@ -0,0 +1,117 @@
+import math
+import random
+import time
+from computer_player import ComputerPlayer
+from board import Board
+
+# A node of the search tree. Rewards are from the point of view of the piece that moved into
+# the node, which is what its parent maximizes when it selects a child.
+class MCTSNode(object):
+    __slots__ = ("key", "piece", "children", "untried_moves", "visits", "total_reward")
+
+    def __init__(self, key, piece, untried_moves):
+        self.key = key
+        self.piece = piece
+        self.children = {}
+        random.shuffle(untried_moves)
+        self.untried_moves = untried_moves
+        self.visits = 0
+        self.total_reward = 0.0
+
+    def get_reward(self, winner):
+        if winner == Board.DRAW:
+            return 0.5
+        return 1.0 if winner == self.piece else 0.0
+
+# Searches with UCT from the current board each move, within a budget of playouts and a time
+# limit in seconds, whichever runs out first. Either one can be None for no limit. After each
+# move the tree is kept, so the subtree of the opponent's reply carries over to the next
+# search. Playouts push and pop moves on the game's own board and leave it as it was.
+class MCTSPlayer(ComputerPlayer):
+    DEFAULT_NUM_PLAYOUTS = 2000
+    DEFAULT_EXPLORATION = math.sqrt(2)
+    __slots__ = ("num_playouts", "time_limit", "exploration", "root")
+
+    def __init__(self, num_playouts=DEFAULT_NUM_PLAYOUTS, time_limit=None, exploration=DEFAULT_EXPLORATION):
+        super().__init__()
+        if num_playouts is None and time_limit is None:
+            raise ValueError("MCTSPlayer needs a playout budget or a time limit")
+        self.num_playouts = num_playouts
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.root = None
+
+    def get_move(self):
+        position = random.choice(self.get_best_moves())
+        self.root = self.root.children[position]
+        return position
+
+    # The most visited moves after searching from the current board
+    def get_best_moves(self):
+        self.root = self._find_root()
+        self.search()
+        max_visits = max(child.visits for child in self.root.children.values())
+        return [position for position, child in self.root.children.items() if child.visits == max_visits]
+
+    def _find_root(self):
+        # The board is either where the last search left it or one opponent move further on
+        if self.root is not None and self.root.piece == -self.piece:
+            if self.root.key == self.board.key:
+                return self.root
+        if self.root is not None and self.root.piece == self.piece:
+            for child in self.root.children.values():
+                if child.key == self.board.key:
+                    return child
+        return MCTSNode(self.board.key, -self.piece, self.board.get_available_moves())
+
+    def search(self):
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        num_playouts = 0
+        # Every move gets at least one playout so that there is always one to choose
+        while self.root.untried_moves or not self._is_budget_spent(num_playouts, deadline):
+            self._playout()
+            num_playouts += 1
+        return num_playouts
+
+    def _is_budget_spent(self, num_playouts, deadline):
+        return (self.num_playouts is not None and num_playouts >= self.num_playouts) or \
+            (deadline is not None and time.perf_counter() >= deadline)
+
+    def _playout(self):
+        board = self.board
+        node = self.root
+        path = [node]
+        moves = []
+        winner = None
+        while not node.untried_moves and node.children:
+            position, node = self._select_child(node)
+            winner, _ = board.push_move(position, node.piece)
+            moves.append(position)
+            path.append(node)
+
+        if winner is None and node.untried_moves:
+            position = node.untried_moves.pop()
+            winner, key = board.push_move(position, -node.piece)
+            child = MCTSNode(key, -node.piece, board.get_available_moves() if winner is None else [])
+            node.children[position] = child
+            moves.append(position)
+            path.append(child)
+            node = child
+
+        piece = -node.piece
+        while winner is None:
+            position = random.choice(board.get_available_moves())
+            winner, _ = board.push_move(position, piece)
+            moves.append(position)
+            piece = -piece
+
+        for position in reversed(moves):
+            board.pop_move(position)
+        for node in path:
+            node.visits += 1
+            node.total_reward += node.get_reward(winner)
+
+    def _select_child(self, node):
+        exploration = self.exploration*math.sqrt(math.log(node.visits))
+        return max(node.children.items(), key=lambda item:
+                   item[1].total_reward/item[1].visits + exploration/math.sqrt(item[1].visits))
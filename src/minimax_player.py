@@ -0,0 +1,91 @@
+import random
+from computer_player import ComputerPlayer
+from board import Board
+from symmetry import Symmetry
+
+# Plays perfectly with a negamax search with alpha-beta pruning. Scores are from the point of
+# view of the player to move, and a win scores more the more empty positions are left, so the
+# quickest win and the slowest loss are preferred. Symmetric states have the same score, so the
+# transposition table is keyed on canonical states. Both tables are shared by every instance,
+# so once warm each move is a dictionary lookup.
+class MinimaxPlayer(ComputerPlayer):
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+    # Center, then corners, then edges
+    MOVE_ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+    transpositions = {}
+    best_moves = {}
+    __slots__ = ()
+
+    def get_move(self):
+        return random.choice(self.get_best_moves())
+
+    def get_best_moves(self):
+        best_moves = self.best_moves.get(self.board.key)
+        if best_moves is None:
+            move_scores = self.get_move_scores()
+            max_score = max(move_scores.values())
+            best_moves = [position for position, score in move_scores.items() if score == max_score]
+            self.best_moves[self.board.key] = best_moves
+        return best_moves
+
+    def get_move_scores(self):
+        move_scores = {}
+        for position in self.board.get_available_moves():
+            winner, _ = self.board.push_move(position, self.piece)
+            move_scores[position] = self._get_score(winner) if winner is not None else \
+                -self._negamax(-self.piece, -self.board.num_empty - 1, self.board.num_empty + 1)
+            self.board.pop_move(position)
+        return move_scores
+
+    def _get_score(self, winner):
+        # Only the player that just moved can have won
+        return 0 if winner == Board.DRAW else self.board.num_empty + 1
+
+    def _negamax(self, piece, alpha, beta):
+        key = Symmetry.get_canonical_key(self.board.key)
+        entry = self.transpositions.get(key)
+        if entry is not None:
+            score, bound = entry
+            if bound == self.EXACT:
+                return score
+            if bound == self.LOWER_BOUND:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        original_alpha = alpha
+        best_score = -Board.NUM_STATES
+        for position in self._order_moves(piece):
+            winner, _ = self.board.push_move(position, piece)
+            score = self._get_score(winner) if winner is not None else -self._negamax(-piece, -beta, -alpha)
+            self.board.pop_move(position)
+            best_score = max(best_score, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = self.UPPER_BOUND
+        elif best_score >= beta:
+            bound = self.LOWER_BOUND
+        else:
+            bound = self.EXACT
+        self.transpositions[key] = (best_score, bound)
+        return best_score
+
+    def _order_moves(self, piece):
+        # Winning moves first, then moves that block the opponent, then by MOVE_ORDER
+        occupied = self.board.x_bits | self.board.o_bits
+        moves = [position for position in self.MOVE_ORDER if not occupied & (1 << position)]
+        return sorted(moves, key=lambda position: self._get_move_priority(position, piece))
+
+    def _get_move_priority(self, position, piece):
+        if self.board.get_winner_after_move(position, piece) == piece:
+            return 0
+        if self.board.get_winner_after_move(position, -piece) == -piece:
+            return 1
+        return 2
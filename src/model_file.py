@@ -0,0 +1,51 @@
+import os
+import json
+import struct
+import numpy as np
+
+# Model file layout: a fixed prefix (magic, version, header length), a JSON header with the
+# params and the dtype, shape and offset of each array, then the raw arrays, each aligned so
+# that it can be memory-mapped in place.
+MAGIC = b"TTTMODEL"
+VERSION = 1
+ALIGNMENT = 64
+PREFIX = struct.Struct("<8sII")
+
+def save_model(filename, params, arrays):
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    header = {"params": params, "arrays": {}}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header, sort_keys=True).encode("utf-8")
+    data_start = _align(PREFIX.size + len(header_bytes))
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + header["arrays"][name]["offset"])
+            f.write(array.tobytes())
+
+    # Replace rather than overwrite so that processes which have the old file mapped keep it
+    os.replace(temp_filename, filename)
+
+def load_model(filename, mode="c"):
+    with open(filename, "rb") as f:
+        magic, version, header_length = PREFIX.unpack(f.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError("{} is not a model file".format(filename))
+        if version > VERSION:
+            raise ValueError("{} has unsupported model file version {}".format(filename, version))
+        header = json.loads(f.read(header_length).decode("utf-8"))
+
+    data_start = _align(PREFIX.size + header_length)
+    arrays = {name: np.memmap(filename, dtype=np.dtype(info["dtype"]), mode=mode,
+                              offset=data_start + info["offset"], shape=tuple(info["shape"]))
+              for name, info in header["arrays"].items()}
+    return header["params"], arrays
+
+def _align(offset):
+    return -(-offset // ALIGNMENT)*ALIGNMENT
@@ -0,0 +1,26 @@
+import os
+import threading
+import model_file
+
+# Process-wide cache of read-only model files. Each file is mapped once and shared by every
+# player that loads it, and is mapped again if the file has been modified since.
+class ModelRegistry(object):
+    def __init__(self):
+        self.models = {}
+        self.lock = threading.Lock()
+
+    def load(self, filename):
+        mtime = os.path.getmtime(filename)
+        with self.lock:
+            model = self.models.get(filename)
+            if model is None or model["mtime"] != mtime:
+                params, learned = model_file.load_model(filename, mode="r")
+                model = {"mtime": mtime, "params": params, "learned": learned}
+                self.models[filename] = model
+            return model["params"], model["learned"]
+
+    def clear(self):
+        with self.lock:
+            self.models = {}
+
+registry = ModelRegistry()
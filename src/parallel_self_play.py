@@ -0,0 +1,95 @@
+import multiprocessing
+import numpy as np
+import utils
+from board import Board
+from batch_self_play import BatchSelfPlay
+from learning_computer_player import LearningComputerPlayer
+from value_table import ArrayValueTable, SharedValueTable
+
+def _play_games(x_player, o_player, num_games, seed):
+    winners = BatchSelfPlay(x_player, o_player, seed).play(num_games)
+    learned_values = [_get_learned_values(player) for player in (x_player, o_player)]
+    visits = [_get_visits(player) for player in (x_player, o_player)]
+    for player in (x_player, o_player):
+        if _is_learner(player) and isinstance(player.values, SharedValueTable):
+            player.values.close()
+    return winners, learned_values, visits
+
+def _is_learner(player):
+    return isinstance(player, LearningComputerPlayer)
+
+def _get_learned_values(player):
+    if _is_learner(player) and player.learning and not isinstance(player.values, SharedValueTable):
+        return player.values.array
+    return None
+
+def _get_visits(player):
+    return player.visits if _is_learner(player) and player.learning else None
+
+# Splits each batch of games across a pool of worker processes. By default every worker plays
+# its share with a copy of the value tables and the copies are averaged back into the players.
+# With shared values, the workers update a single shared copy instead (Hogwild style). Used as a
+# context manager it is closed however the block exits, so shared memory is never left behind.
+class ParallelSelfPlay(object):
+    def __init__(self, num_workers, seed=None, shared=False):
+        self.num_workers = num_workers
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.pool = multiprocessing.Pool(num_workers)
+        self.shared = shared
+        self.shared_players = []
+
+    def play(self, x_player, o_player, num_games):
+        x_player.set_piece(Board.X)
+        o_player.set_piece(Board.O)
+        if self.shared:
+            self._share_values(x_player)
+            self._share_values(o_player)
+        seeds = self.seed_sequence.spawn(self.num_workers)
+        tasks = [(x_player, o_player, worker_num_games, seed)
+                 for worker_num_games, seed in zip(utils.split_games(num_games, self.num_workers), seeds)]
+        results = self.pool.starmap(_play_games, tasks)
+        for index, player in enumerate([x_player, o_player]):
+            worker_values = [values[index] for _, values, _ in results]
+            if worker_values[0] is not None:
+                self._merge_values(player, worker_values)
+            worker_visits = [visits[index] for _, _, visits in results]
+            if worker_visits[0] is not None:
+                self._merge_visits(player, worker_visits)
+        return np.concatenate([winners for winners, _, _ in results])
+
+    def _share_values(self, player):
+        if _is_learner(player) and not isinstance(player.values, SharedValueTable):
+            player.values = SharedValueTable(player.values)
+            self.shared_players.append(player)
+
+    # Each value is averaged over the workers that changed it, since the ones that didn't play
+    # that state only hold a copy of the value the batch started from
+    def _merge_values(self, player, worker_values):
+        worker_values = np.stack(worker_values)
+        changed = ~np.isnan(worker_values) & (worker_values != player.values.array)
+        counts = changed.sum(axis=0)
+        totals = np.where(changed, worker_values, 0.0).sum(axis=0)
+        np.divide(totals, counts, out=player.values.array, where=counts > 0)
+
+    def _merge_visits(self, player, worker_visits):
+        # Every worker started from the same counts, so only the visits each one added are summed
+        player.visits += (np.stack(worker_visits) - player.visits).sum(axis=0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(terminate=exc_type is not None)
+
+    # Terminating stops the workers without waiting for the games they are playing
+    def close(self, terminate=False):
+        if terminate:
+            self.pool.terminate()
+        else:
+            self.pool.close()
+        self.pool.join()
+        for player in self.shared_players:
+            shared_values = player.values
+            player.values = ArrayValueTable(shared_values)
+            shared_values.unlink()
+        self.shared_players = []
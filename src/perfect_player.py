@@ -0,0 +1,65 @@
+import random
+import utils
+from model_registry import registry
+from computer_player import ComputerPlayer
+
+# Plays the optimal policy that solve_game.py writes to the data directory, so that each move
+# is a single table lookup. The tables are shared by every instance, and come from the model
+# registry on each use, so they are reloaded once solve_game.py has written them again.
+class PerfectPlayer(ComputerPlayer):
+    FILENAME = "PerfectPlayer.model"
+    # MOVE_LISTS[mask] lists the positions set in a best moves bitmask
+    MOVE_LISTS = tuple([position for position in range(9) if mask & (1 << position)] for mask in range(1 << 9))
+    tables = None
+    scores = None
+    best_moves = None
+    __slots__ = ()
+
+    def get_move(self):
+        return random.choice(self.get_best_moves())
+
+    def get_best_moves(self):
+        return self.MOVE_LISTS[self.get_best_move_masks()[self.board.key]]
+
+    # The score of the position for the player to move, as for MinimaxPlayer.get_move_scores
+    def get_score(self):
+        return self.get_scores()[self.board.key]
+
+    def get_move_scores(self):
+        scores = self.get_scores()
+        move_scores = {}
+        for position in self.board.get_available_moves():
+            winner, key = self.board.push_move(position, self.piece)
+            move_scores[position] = -scores[key] if winner is None else \
+                0 if winner == self.board.DRAW else self.board.num_empty + 1
+            self.board.pop_move(position)
+        return move_scores
+
+    @classmethod
+    def get_scores(cls):
+        cls.load_tables()
+        return cls.scores
+
+    @classmethod
+    def get_best_move_masks(cls):
+        cls.load_tables()
+        return cls.best_moves
+
+    @classmethod
+    def get_score_array(cls):
+        return cls.load_tables()["scores"]
+
+    @classmethod
+    def get_best_move_array(cls):
+        return cls.load_tables()["best_moves"]
+
+    # Lists index faster than memory-mapped arrays, and the tables are small. They are only
+    # converted again when the registry has mapped a new version of the file.
+    @classmethod
+    def load_tables(cls):
+        _, tables = registry.load(utils.get_path("data", cls.FILENAME))
+        if tables is not cls.tables:
+            cls.scores = tables["scores"].tolist()
+            cls.best_moves = tables["best_moves"].tolist()
+            cls.tables = tables
+        return tables
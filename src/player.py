@@ -1,6 +1,8 @@
 from board import Board
 
 class Player(object):
+    __slots__ = ("board", "piece")
+
     def __init__(self):
         self.board = None
         self.piece = None
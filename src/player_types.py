@@ -1,19 +1,31 @@
 from operator import itemgetter
 from td_learning_player import TDLearningPlayer
 from td_symmetric_learning_player import TDSymmetricLearningPlayer
+from td_lambda_learning_player import TDLambdaLearningPlayer
+from q_learning_player import QLearningPlayer
 from random_player import RandomPlayer
 from human_player import HumanPlayer
+from minimax_player import MinimaxPlayer
+from perfect_player import PerfectPlayer
+from mcts_player import MCTSPlayer
+from computer_player import ComputerPlayer
 
 LEARNERS = \
 {
     "TD": {"class": TDLearningPlayer, "description": "Temporal Difference Learning Player"},
     "TDS": {"class": TDSymmetricLearningPlayer,
-            "description": "Temporal Difference Symmetric Learning Player"}
+            "description": "Temporal Difference Symmetric Learning Player"},
+    "TDL": {"class": TDLambdaLearningPlayer,
+            "description": "Temporal Difference Lambda Learning Player"},
+    "Q": {"class": QLearningPlayer, "description": "Q-Learning Player"}
 }
 NON_LEARNERS = \
 {
     "Random": {"class": RandomPlayer, "description": "Random Player"},
-    "Human": {"class": HumanPlayer, "description": "Human Player"}
+    "Human": {"class": HumanPlayer, "description": "Human Player"},
+    "Minimax": {"class": MinimaxPlayer, "description": "Minimax Player"},
+    "Perfect": {"class": PerfectPlayer, "description": "Perfect Player"},
+    "MCTS": {"class": MCTSPlayer, "description": "Monte Carlo Tree Search Player"}
 }
 
 def get_learning_player(player_type):
@@ -28,6 +40,10 @@ def get_player(player_type):
 def get_learning_player_types():
     return sorted(LEARNERS.keys())
 
+def get_opponent_types():
+    return sorted(player_type for player_type, value in NON_LEARNERS.items()
+                  if issubclass(value["class"], ComputerPlayer))
+
 def get_player_types():
     return sorted(get_learning_player_types() + list(NON_LEARNERS.keys()))
 
@@ -0,0 +1,73 @@
+import numpy as np
+from td_learning_player import TDLearningPlayer
+from board import Board
+from value_table import ArrayValueTable
+from state_tables import LEGAL_MOVES, MOVE_DELTAS, WINNERS
+
+# Q-learning with a dense table of values for each state and move, rather than values of the
+# afterstates. At the end of each game the player's own moves are updated from last to first,
+# each towards the best value of the state it moved from next, or the reward for its last move.
+# Moves without a value start at the reward if they end the game and 0.5 otherwise. Visits are
+# counted for each state and move, like the values, and reported for the states moved from.
+class QLearningPlayer(TDLearningPlayer):
+    VISITS_SHAPE = (Board.NUM_STATES, 9)
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__()
+        self.values = ArrayValueTable(array=np.full((Board.NUM_STATES, 9), np.nan, dtype=np.float32))
+
+    def use_dense_values(self):
+        pass
+
+    def get_num_states(self):
+        return int((~np.isnan(self.values.array)).any(axis=1).sum())
+
+    def get_move_values(self):
+        return self._get_move_values(self.board.key, self.board.get_available_moves())
+
+    def _get_move_values(self, state, positions):
+        row = self.values.array[state].tolist()
+        return {position: self._get_initial_move_value(state, position) if row[position] != row[position]
+                else row[position] for position in positions}
+
+    def _get_initial_move_value(self, state, position):
+        winner = WINNERS[state + Board.MOVE_DELTAS[self.piece][position]]
+        return 0.5 if winner == Board.EMPTY else self._get_reward(winner)
+
+    def get_state_move_values(self, states):
+        legal_moves = LEGAL_MOVES[states]
+        values = self.values.array[states]
+        initial_values = self._get_initial_values(states[:, np.newaxis] + MOVE_DELTAS[self.piece]*legal_moves)
+        return np.where(legal_moves, np.where(np.isnan(values), initial_values, values), -np.inf)
+
+    def set_reward(self, winner):
+        if self.learning:
+            target = self._get_reward(winner)
+            for state, position in reversed(self._get_moves(self.states)):
+                self.add_visits((state, position))
+                value = float(self.values.array[state, position])
+                if value != value:
+                    value = self._get_initial_move_value(state, position)
+                value += self.get_alpha((state, position))*(target - value)
+                self.values.array[state, position] = value
+                target = self.get_next_target(target, self._get_max_value(state))
+
+    def _get_state_visits(self):
+        return self.visits.sum(axis=1)
+
+    def _get_max_value(self, state):
+        positions = [position for position in range(9) if state // Board.CELL_WEIGHTS[position] % 3 == 0]
+        return max(self._get_move_values(state, positions).values())
+
+    def _get_moves(self, states):
+        # The stored states follow every move of a game from the empty board, so the player's
+        # own moves are the ones that add its piece
+        moves = []
+        last_state = 0
+        deltas = Board.MOVE_DELTAS[self.piece]
+        for state in states:
+            if state - last_state in deltas:
+                moves.append((last_state, deltas.index(state - last_state)))
+            last_state = state
+        return moves
@@ -2,5 +2,11 @@ import random
 from computer_player import ComputerPlayer
 
 class RandomPlayer(ComputerPlayer):
+    __slots__ = ()
+
     def get_move(self):
-        return random.choice(self.board.get_available_moves())
+        return random.choice(self.get_best_moves())
+
+    # Every available move is as good as any other to a random player
+    def get_best_moves(self):
+        return self.board.get_available_moves()
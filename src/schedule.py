@@ -0,0 +1,30 @@
+# A parameter that moves from an initial value to a final value over a number of steps. Every
+# schedule type is set by the same three values, so it can be stored with the other params.
+class Schedule(object):
+    TYPES = ["constant", "linear", "exponential", "harmonic"]
+
+    def __init__(self, initial, type="constant", final=None, num_steps=1):
+        if type not in self.TYPES:
+            raise ValueError("Unknown schedule type: {}".format(type))
+        if type != "constant" and final is None:
+            raise ValueError("A {} schedule needs a final value".format(type))
+        if type in ("exponential", "harmonic") and (initial <= 0 or final <= 0):
+            raise ValueError("A {} schedule needs positive initial and final values".format(type))
+
+        self.initial = initial
+        self.type = type
+        self.final = final
+        self.num_steps = max(num_steps, 1)
+
+    def get_value(self, step):
+        fraction = min(step, self.num_steps)/self.num_steps
+        if self.type == "linear":
+            return self.initial + (self.final - self.initial)*fraction
+        if self.type == "exponential":
+            return self.initial*(self.final/self.initial)**fraction
+        if self.type == "harmonic":
+            return self.initial/(1 + (self.initial/self.final - 1)*fraction)
+        return self.initial
+
+    def get_params(self):
+        return {"type": self.type, "final": self.final, "num_steps": self.num_steps}
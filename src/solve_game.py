@@ -0,0 +1,54 @@
+import sys
+import argparse
+import numpy as np
+import utils
+import model_file
+from board import Board
+from state_tables import DIGITS, MOVE_DELTAS, WINNERS
+
+# Solves the whole game by backward induction over the encoded states, from full boards back to
+# the empty board. Scores are from the point of view of the player to move, the same as
+# MinimaxPlayer's, and best_moves holds a bitmask of the moves that reach the best score.
+class GameSolver(object):
+    FILENAME = "PerfectPlayer.model"
+    POSITION_BITS = 1 << np.arange(9)
+
+    def __init__(self, args):
+        self._parse_args(args)
+
+    def _parse_args(self, args):
+        parser = argparse.ArgumentParser(
+            description="Solve Tic-Tac-Toe and save the optimal policy for the Perfect Player")
+        return parser.parse_args(args)
+
+    def solve(self):
+        num_x = (DIGITS == Board.PIECE_DIGITS[Board.X]).sum(axis=1)
+        num_o = (DIGITS == Board.PIECE_DIGITS[Board.O]).sum(axis=1)
+        scores = np.zeros(Board.NUM_STATES, dtype=np.int8)
+        best_moves = np.zeros(Board.NUM_STATES, dtype=np.uint16)
+        for num_pieces in reversed(range(9)):
+            piece = Board.X if num_pieces % 2 == 0 else Board.O
+            states = np.flatnonzero((num_x + num_o == num_pieces) & (num_x - num_o == num_pieces % 2) &
+                                    (WINNERS == Board.EMPTY))
+            available = DIGITS[states] == 0
+            next_states = states[:, np.newaxis] + MOVE_DELTAS[piece]*available
+            winners = WINNERS[next_states]
+            move_scores = np.where(winners == piece, 9 - num_pieces, -scores[next_states])
+            move_scores[winners == Board.DRAW] = 0
+            move_scores[~available] = np.iinfo(np.int8).min
+            scores[states] = move_scores.max(axis=1)
+            best_moves[states] = ((move_scores == scores[states, np.newaxis])*self.POSITION_BITS).sum(axis=1)
+        return {"scores": scores, "best_moves": best_moves}
+
+    def save(self, solution):
+        filename = utils.get_path("data", self.FILENAME)
+        model_file.save_model(filename, {}, solution)
+        print("Saved {} ({} positions to move from)".format(filename, np.count_nonzero(solution["best_moves"])))
+
+def main(args=sys.argv[1:]):
+    solver = GameSolver(args)
+    solver.save(solver.solve())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
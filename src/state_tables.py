@@ -0,0 +1,18 @@
+import numpy as np
+from board import Board
+
+# Lookup tables indexed by encoded board state (see Board.encode_state). No winner is
+# represented by Board.EMPTY since the tables are integer arrays.
+WEIGHTS = np.array(Board.CELL_WEIGHTS)
+DIGITS = ((np.arange(Board.NUM_STATES)[:, np.newaxis] // WEIGHTS) % 3).astype(np.int8)
+LEGAL_MOVES = DIGITS == 0
+MOVE_DELTAS = {Board.X: Board.PIECE_DIGITS[Board.X]*WEIGHTS, Board.O: Board.PIECE_DIGITS[Board.O]*WEIGHTS}
+
+def _get_winners():
+    winners = np.where((DIGITS != 0).all(axis=1), Board.DRAW, Board.EMPTY).astype(np.int8)
+    for piece in (Board.O, Board.X):
+        for line in Board.WINNING_LINES:
+            winners[(DIGITS[:, line] == Board.PIECE_DIGITS[piece]).all(axis=1)] = piece
+    return winners
+
+WINNERS = _get_winners()
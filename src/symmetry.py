@@ -1,3 +1,17 @@
+import numpy as np
+from state_tables import DIGITS, WEIGHTS
+
+def _get_permutation(symmetry_function):
+    permutation = [None]*9
+    for row in range(3):
+        for col in range(3):
+            new_row, new_col = symmetry_function(row, col)
+            permutation[3*new_row+new_col] = 3*row+col
+    return tuple(permutation)
+
+def _get_symmetric_keys(permutations):
+    return np.stack([DIGITS[:, permutation] @ WEIGHTS for permutation in permutations], axis=1)
+
 class Symmetry(object):
     SYMMETRY_FUNCTIONS = \
     (
@@ -11,14 +25,24 @@ class Symmetry(object):
         lambda r,c: (2-c,2-r)  # Reflect right diagonal
     )
 
+    # PERMUTATIONS[i][new_position] is the position that moves to new_position under symmetry i
+    PERMUTATIONS = tuple(map(_get_permutation, SYMMETRY_FUNCTIONS))
+
+    # SYMMETRIC_KEYS[key] holds the encoded state of each symmetry of key, in SYMMETRY_FUNCTIONS
+    # order. CANONICAL_KEYS[key] is the smallest of these and identifies the symmetry class.
+    SYMMETRIC_KEYS = _get_symmetric_keys(PERMUTATIONS)
+    CANONICAL_KEYS = SYMMETRIC_KEYS.min(axis=1)
+    _SYMMETRIC_KEY_LIST = SYMMETRIC_KEYS.tolist()
+    _CANONICAL_KEY_LIST = CANONICAL_KEYS.tolist()
+
     def get_symmetries(self, state):
-        for symmetry_function in self.SYMMETRY_FUNCTIONS:
-            yield self._transform(symmetry_function, state)
-
-    def _transform(self, symmetry_function, state):
-        new_state = [None]*9
-        for row in range(3):
-            for col in range(3):
-                new_row, new_col = symmetry_function(row, col)
-                new_state[3*new_row+new_col] = state[3*row+col]
-        return tuple(new_state)
+        for permutation in self.PERMUTATIONS:
+            yield tuple(state[position] for position in permutation)
+
+    @staticmethod
+    def get_symmetric_keys(key):
+        return Symmetry._SYMMETRIC_KEY_LIST[key]
+
+    @staticmethod
+    def get_canonical_key(key):
+        return Symmetry._CANONICAL_KEY_LIST[key]
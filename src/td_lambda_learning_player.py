@@ -0,0 +1,20 @@
+from td_learning_player import TDLearningPlayer
+
+# TD(lambda) with the offline lambda-return: the backward sweep at the end of each game moves
+# each state towards a mix of the next state's updated value and that state's own target, so
+# lambda=0 is the same as TDLearningPlayer and lambda=1 moves every state towards the reward.
+class TDLambdaLearningPlayer(TDLearningPlayer):
+    DEFAULT_LAMBDA = 0.5
+    __slots__ = ("lambda_",)
+
+    def set_params(self, **kwargs):
+        super().set_params(**kwargs)
+        self.lambda_ = kwargs.get("lambda", self.DEFAULT_LAMBDA)
+
+    def get_params(self):
+        params = super().get_params()
+        params["lambda"] = self.lambda_
+        return params
+
+    def get_next_target(self, target, value):
+        return (1 - self.lambda_)*value + self.lambda_*target
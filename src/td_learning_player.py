@@ -1,13 +1,21 @@
 import random
+import numpy as np
 from learning_computer_player import LearningComputerPlayer
 from board import Board
+from value_table import ArrayValueTable
+from schedule import Schedule
+from state_tables import LEGAL_MOVES, MOVE_DELTAS, WINNERS
 
 class TDLearningPlayer(LearningComputerPlayer):
     DEFAULT_ALPHA = 0.1
     DEFAULT_EPSILON = 0.1
     DEFAULT_X_DRAW_REWARD = 0.5
     DEFAULT_O_DRAW_REWARD = 0.5
-    
+    # A visit count for each value that is updated
+    VISITS_SHAPE = (Board.NUM_STATES,)
+    __slots__ = ("values", "states", "alpha", "epsilon", "draw_rewards", "schedules", "schedule_step",
+                 "visit_alpha", "visits")
+
     def __init__(self):
         super().__init__()
         self.values = {}
@@ -15,22 +23,43 @@ class TDLearningPlayer(LearningComputerPlayer):
 
     def set_params(self, **kwargs):
         super().set_params(**kwargs)
-        self.alpha = kwargs.get("alpha", self.DEFAULT_ALPHA)
-        self.epsilon = kwargs.get("epsilon", self.DEFAULT_EPSILON)
+        self.schedules = \
+        {
+            "alpha": Schedule(kwargs.get("alpha", self.DEFAULT_ALPHA),
+                              **kwargs.get("alpha_schedule", {})),
+            "epsilon": Schedule(kwargs.get("epsilon", self.DEFAULT_EPSILON),
+                                **kwargs.get("epsilon_schedule", {}))
+        }
         self.draw_rewards = {Board.X: kwargs.get("x_draw_reward", self.DEFAULT_X_DRAW_REWARD),
                              Board.O: kwargs.get("o_draw_reward", self.DEFAULT_O_DRAW_REWARD)}
+        self.set_schedule_step(kwargs.get("schedule_step", 0))
+        # With visit_alpha, each state's step size is 1/N(s), the number of times the state has
+        # been updated, until that drops to alpha
+        self.visit_alpha = kwargs.get("visit_alpha", False)
+        count_visits = kwargs.get("count_visits", False) or self.visit_alpha
+        self.visits = np.zeros(self.VISITS_SHAPE, dtype=np.int64) if count_visits else None
 
     def get_params(self):
         return \
         {
-            "alpha": self.alpha,
-            "epsilon": self.epsilon,
+            "alpha": self.schedules["alpha"].initial,
+            "epsilon": self.schedules["epsilon"].initial,
             "x_draw_reward": self.draw_rewards[Board.X],
-            "o_draw_reward": self.draw_rewards[Board.O]
+            "o_draw_reward": self.draw_rewards[Board.O],
+            "alpha_schedule": self.schedules["alpha"].get_params(),
+            "epsilon_schedule": self.schedules["epsilon"].get_params(),
+            "schedule_step": self.schedule_step,
+            "count_visits": self.visits is not None,
+            "visit_alpha": self.visit_alpha
         }
 
+    def set_schedule_step(self, step):
+        self.schedule_step = step
+        self.alpha = self.schedules["alpha"].get_value(step)
+        self.epsilon = self.schedules["epsilon"].get_value(step)
+
     def store_state(self):
-        self.states.append(tuple(self.board.state))
+        self.states.append(self.board.key)
         
     def reset(self):
         super().reset()
@@ -46,21 +75,59 @@ class TDLearningPlayer(LearningComputerPlayer):
     def _get_value_and_state(self, state, winner=None):
         value, new_state = self._find_value_and_state(state)
         if value is None:
-            value = 0.5 if winner is None else self._get_reward(winner)
-            self.values[new_state] = value
+            value = self._get_initial_value(new_state, winner)
         return value, new_state
 
+    def _get_initial_value(self, state, winner):
+        value = 0.5 if winner is None else self._get_reward(winner)
+        if self.learning:
+            self.values[state] = value
+        return value
+
     def _find_value_and_state(self, state):
         return self.values.get(state), state
 
+    def get_stored_states(self, states):
+        return states
+
     def set_reward(self, winner):
         if self.learning:
             last_value, _ = self._get_value_and_state(self.states[-1], winner)
             for state in reversed(self.states[:-1]):
                 current_value, new_state = self._get_value_and_state(state)
-                current_value += self.alpha*(last_value - current_value)
+                self.add_visits(new_state)
+                current_value += self.get_alpha(new_state)*(last_value - current_value)
                 self.values[new_state] = current_value
-                last_value = current_value
+                last_value = self.get_next_target(last_value, current_value)
+
+    # The visit methods take a single state or an array of states, or whatever else indexes the
+    # visits, such as states and the moves from them
+    def add_visits(self, states, counts=1):
+        if self.visits is not None:
+            np.add.at(self.visits, states, counts)
+
+    # counts is how many of the updates just counted are averaged into one, so that a batch of
+    # them takes the same step towards their mean target as one at a time would
+    def get_alpha(self, states, counts=1):
+        if not self.visit_alpha:
+            return self.alpha
+        return np.maximum(counts/np.maximum(self.visits[states], 1), self.alpha)
+
+    def get_visit_stats(self):
+        if self.visits is None:
+            return None
+        visits = self._get_state_visits()
+        visited = visits[visits > 0]
+        if len(visited) == 0:
+            return {"num_visited": 0, "min": 0, "median": 0, "max": 0}
+        return {"num_visited": len(visited), "min": int(visited.min()),
+                "median": float(np.median(visited)), "max": int(visited.max())}
+
+    def _get_state_visits(self):
+        return self.visits
+
+    def get_next_target(self, target, value):
+        return value
 
     def get_move(self):
         return self._choose_random_move() if self.learning and random.random() < self.epsilon \
@@ -70,29 +137,62 @@ class TDLearningPlayer(LearningComputerPlayer):
         return random.choice(self.board.get_available_moves())
 
     def _choose_best_move(self):
-        max_value = -1
-        best_moves = []
-        for position, value in self.get_move_values().items():
-            if value > max_value:
-                max_value = value
-                best_moves = [position]
-            elif value == max_value:
-                best_moves.append(position)
-        return random.choice(best_moves)
+        return random.choice(self.get_best_moves())
 
     def get_move_values(self):
+        # The afterstate keys come straight from the per-position deltas without playing each
+        # move, and the winner is only needed for afterstates without a value yet
         move_values = {}
+        key = self.board.key
+        deltas = Board.MOVE_DELTAS[self.piece]
         for position in self.board.get_available_moves():
-            with self.board.try_move(position, self.piece) as (winner, state):
-                move_values[position], _ = self._get_value_and_state(state, winner)
+            value, state = self._find_value_and_state(key + deltas[position])
+            if value is None:
+                value = self._get_initial_value(state, self.board.get_winner_after_move(position, self.piece))
+            move_values[position] = value
 
         return move_values
 
+    # Vectorized lookup of an array of states, which needs dense values. States without a value
+    # get their initial value, without storing it.
+    def get_values(self, states):
+        values = self.values.array[self.get_stored_states(states)]
+        return np.where(np.isnan(values), self._get_initial_values(states), values)
+
+    # The value of each move from each of an array of states, with -inf for illegal moves
+    def get_state_move_values(self, states):
+        legal_moves = LEGAL_MOVES[states]
+        next_states = states[:, np.newaxis] + MOVE_DELTAS[self.piece]*legal_moves
+        return np.where(legal_moves, self.get_values(next_states), -np.inf)
+
+    def _get_initial_values(self, states):
+        winners = WINNERS[states]
+        initial_values = np.where(winners == self.piece, 1.0, 0.5)
+        initial_values[winners == -self.piece] = 0.0
+        initial_values[winners == Board.DRAW] = self.draw_rewards[self.piece]
+        return initial_values
+
     def get_num_states(self):
         return len(self.values)
 
-    def load(self, piece):
-        self.values = self._load_file(piece)
+    def use_dense_values(self):
+        self.values = ArrayValueTable(self.values)
+
+    def load(self, piece, shared=False):
+        learned = self._load_file(piece, shared)
+        self.values = ArrayValueTable(array=learned["values"])
+        if self.visits is not None and "visits" in learned and learned["visits"].shape == self.visits.shape:
+            self.visits = learned["visits"]
+
+    def load_legacy(self, piece):
+        self.values = self._encode_states(self._load_legacy_file(piece))
+
+    def _encode_states(self, values):
+        return {Board.encode_state(state) if isinstance(state, tuple) else state: value
+                for state, value in values.items()}
 
     def save(self):
-        self._save_file(self.values)
+        learned = {"values": ArrayValueTable(self.values).array}
+        if self.visits is not None:
+            learned["visits"] = self.visits
+        self._save_file(learned)
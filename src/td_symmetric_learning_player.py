@@ -2,11 +2,15 @@ from td_learning_player import TDLearningPlayer
 from symmetry import Symmetry
 
 class TDSymmetricLearningPlayer(TDLearningPlayer):
-    def _find_value_and_state(self, state, winner=None):
-        for symmetric_state in Symmetry().get_symmetries(state):
-            value = self.values.get(symmetric_state)
-            if value is not None:
-                state = symmetric_state
-                break
-
-        return value, state
+    __slots__ = ()
+
+    def _find_value_and_state(self, state):
+        canonical_state = Symmetry.get_canonical_key(state)
+        return self.values.get(canonical_state), canonical_state
+
+    def get_stored_states(self, states):
+        return Symmetry.CANONICAL_KEYS[states]
+
+    def _encode_states(self, values):
+        return {Symmetry.get_canonical_key(state) if isinstance(state, int) else state: value
+                for state, value in super()._encode_states(values).items()}
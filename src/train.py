@@ -1,23 +1,43 @@
 import sys
 import argparse
 import textwrap
+import contextlib
 import pickle
+import numpy as np
 import utils
 import player_types
 from board import Board
 from learning_computer_player import run_if_learner
-from random_player import RandomPlayer
 from game_controller import GameController
+from batch_self_play import BatchSelfPlay
+from parallel_self_play import ParallelSelfPlay
+from value_table import ArrayValueTable
+from schedule import Schedule
+from audit import audit_player
 
 class Trainer(object):
+    # BatchSelfPlay can only play these besides learners
+    VECTORIZED_OPPONENTS = ("Perfect", "Random")
+
     def __init__(self, args):
         parsed_args = self._parse_args(args)
         self.num_games = parsed_args.num_games
         self.num_batches = parsed_args.num_batches
+        self.vectorized = parsed_args.vectorized or parsed_args.workers > 1
+        self.schedule_by_game = parsed_args.schedule_by == "game"
+        self.game_number = 0
+        self.parallel = ParallelSelfPlay(parsed_args.workers, shared=parsed_args.shared) \
+            if parsed_args.workers > 1 else None
         self.player1 = self._init_player(parsed_args)
         self.player2 = self._init_player(parsed_args)
-        self.random_player = RandomPlayer()
-        
+        self.opponent_type = parsed_args.opponent
+        self.opponent = player_types.get_player(parsed_args.opponent)
+        self.thresholds = {"max_delta": parsed_args.max_delta, "mean_delta": parsed_args.mean_delta,
+                           "loss_rate": parsed_args.max_loss_rate}
+        self.early_stopping = any(threshold is not None for threshold in self.thresholds.values())
+        self.patience = parsed_args.patience
+        self.audit = parsed_args.audit
+
     def _parse_args(self, args):
         parser = argparse.ArgumentParser(
             description="Train Machine Learning Tic-Tac-Toe Players",
@@ -31,38 +51,169 @@ class Trainer(object):
         parser.add_argument(
             "-l", "--learning-type", choices=player_types.get_learning_player_types(),
             default="TD", dest="learning_type", metavar="LEARNING_TYPE")
+        parser.add_argument(
+            "-O", "--opponent", choices=player_types.get_opponent_types(), default="Random",
+            help="player to train and compete against besides self play")
         parser.add_argument("-a", "--alpha", type=float, help="learning rate")
         parser.add_argument("-e", "--epsilon", type=float, help="exploration rate")
         parser.add_argument("-x", "--x-draw-reward", type=float, help="X draw reward")
         parser.add_argument("-o", "--o-draw", type=float, help="O draw reward")
-        return parser.parse_args(args)
+        parser.add_argument(
+            "-L", "--lambda", type=float, help="trace decay for the TDL learning type", dest="lambda")
+        parser.add_argument(
+            "-d", "--dense", action="store_true", help="store values in a dense NumPy array")
+        parser.add_argument(
+            "-v", "--vectorized", action="store_true",
+            help="play each batch of games in lockstep with NumPy (implies --dense)")
+        parser.add_argument(
+            "-w", "--workers", default=1, type=int,
+            help="number of processes to split each batch across (implies --vectorized)")
+        parser.add_argument(
+            "-s", "--shared", action="store_true",
+            help="have worker processes update one shared copy of the values instead of merging")
+        parser.add_argument(
+            "-A", "--alpha-schedule", choices=Schedule.TYPES, default="constant",
+            dest="alpha_schedule_type", help="how the learning rate moves from --alpha to --final-alpha")
+        parser.add_argument(
+            "-E", "--epsilon-schedule", choices=Schedule.TYPES, default="constant",
+            dest="epsilon_schedule_type", help="how the exploration rate moves from --epsilon to --final-epsilon")
+        parser.add_argument(
+            "-f", "--final-alpha", type=float, help="learning rate at the end of training")
+        parser.add_argument(
+            "-F", "--final-epsilon", type=float, help="exploration rate at the end of training")
+        parser.add_argument(
+            "-S", "--schedule-by", choices=["batch", "game"], default="batch",
+            help="step the schedules once per batch or once per game\n"
+                 "(vectorized batches always step once per batch)")
+        parser.add_argument(
+            "-c", "--count-visits", action="store_true", help="count how many times each state is updated")
+        parser.add_argument(
+            "-V", "--visit-alpha", action="store_true",
+            help="use 1/(number of updates) as each state's learning rate until it drops to alpha\n"
+                 "(implies --count-visits)")
+        parser.add_argument(
+            "-u", "--audit", action="store_true",
+            help="audit both players against perfect play after each batch (implies --dense)")
+        parser.add_argument(
+            "-M", "--max-delta", type=float,
+            help="stop early once no value changes by more than this in a batch")
+        parser.add_argument(
+            "-m", "--mean-delta", type=float,
+            help="stop early once values change by less than this on average in a batch")
+        parser.add_argument(
+            "-r", "--max-loss-rate", type=float,
+            help="stop early once neither player loses more than this fraction of games against the\n"
+                 "opponent chosen with --opponent")
+        parser.add_argument(
+            "-k", "--patience", default=3, type=int,
+            help="number of batches in a row that must meet the early stopping thresholds")
+        parsed_args = parser.parse_args(args)
+        if parsed_args.workers < 1:
+            parser.error("--workers must be at least 1")
+        if parsed_args.patience < 1:
+            parser.error("--patience must be at least 1")
+        for name in ["alpha", "epsilon"]:
+            schedule_type = getattr(parsed_args, name + "_schedule_type")
+            if schedule_type != "constant" and getattr(parsed_args, "final_" + name) is None:
+                parser.error("--final-{} is needed for a {} {} schedule".format(name, schedule_type, name))
+        vectorized = parsed_args.vectorized or parsed_args.workers > 1
+        if vectorized and parsed_args.opponent not in self.VECTORIZED_OPPONENTS:
+            parser.error("vectorized training can only play against {} opponents".format(
+                " or ".join(self.VECTORIZED_OPPONENTS)))
+        return parsed_args
 
     def _init_player(self, parsed_args):
         player = player_types.get_learning_player(parsed_args.learning_type)
         params = {key: value for key, value in parsed_args.__dict__.items() if value is not None}
+        params["alpha_schedule"] = self._get_schedule_params(
+            parsed_args.alpha_schedule_type, parsed_args.final_alpha)
+        params["epsilon_schedule"] = self._get_schedule_params(
+            parsed_args.epsilon_schedule_type, parsed_args.final_epsilon)
         player.set_params(**params)
+        if parsed_args.dense or self.vectorized or parsed_args.audit:
+            player.use_dense_values()
         return player
 
+    def _get_schedule_params(self, schedule_type, final):
+        # The last game or batch is played with the final value
+        num_steps = self.num_games if self.schedule_by_game else -(-self.num_games//self.num_batches)
+        return {"type": schedule_type, "final": final, "num_steps": num_steps - 1}
+
+    def _set_schedule_step(self, step):
+        self.player1.set_schedule_step(step)
+        self.player2.set_schedule_step(step)
+
     def train(self):
         stats = \
         {
             "train_self": [], "train_x_vs_random": [], "train_o_vs_random": [],
             "compete_self": [], "compete_x_vs_random": [], "compete_o_vs_random": []
         }
+        with self.parallel or contextlib.nullcontext():
+            self._train(stats)
+        return stats
+
+    def _train(self, stats):
+        num_converged_batches = 0
         for game_number in range(0, self.num_games, self.num_batches):
             self._show_game_numbers(game_number)
+            self.game_number = game_number
+            self._set_schedule_step(game_number if self.schedule_by_game else game_number//self.num_batches)
+            old_values = self._get_values() if self.early_stopping else None
             stats["train_self"].append(self._train_batch(self.player1, self.player2, "Train self"))
             stats["train_x_vs_random"].append(
-                self._train_batch(self.player1, self.random_player, "Train X vs. random"))
+                self._train_batch(self.player1, self.opponent, "Train X vs. " + self.opponent_type))
             stats["train_o_vs_random"].append(
-                self._train_batch(self.random_player, self.player2, "Train O vs. random"))
+                self._train_batch(self.opponent, self.player2, "Train O vs. " + self.opponent_type))
             stats["compete_self"].append(self._compete_batch(self.player1, self.player2, "Compete self"))
             stats["compete_x_vs_random"].append(
-                self._compete_batch(self.player1, self.random_player, "Compete X vs. Random"))
+                self._compete_batch(self.player1, self.opponent, "Compete X vs. " + self.opponent_type))
             stats["compete_o_vs_random"].append(
-                self._compete_batch(self.random_player, self.player2, "Compete O vs. Random"))
+                self._compete_batch(self.opponent, self.player2, "Compete O vs. " + self.opponent_type))
+            self._add_visit_stats(stats)
+            if self.audit:
+                self._add_audit_stats(stats)
+            if self.early_stopping:
+                num_converged_batches = num_converged_batches + 1 \
+                    if self._is_converged(old_values, stats) else 0
+                if num_converged_batches >= self.patience:
+                    print("Stopping early after {} games".format(game_number+self.num_batches))
+                    break
 
-        return stats
+    def _add_visit_stats(self, stats):
+        visit_stats = {Board.X: self.player1.get_visit_stats(), Board.O: self.player2.get_visit_stats()}
+        if visit_stats[Board.X] is not None:
+            for piece, piece_stats in visit_stats.items():
+                print("- {} visits: states={num_visited}, min={min}, median={median}, max={max}".format(
+                    Board.format_piece(piece), **piece_stats))
+            stats.setdefault("visits", []).append(visit_stats)
+
+    def _add_audit_stats(self, stats):
+        audit_stats = {Board.X: audit_player(self.player1)[None], Board.O: audit_player(self.player2)[None]}
+        for piece, piece_stats in audit_stats.items():
+            print("- {} audit: suboptimal={:.4f}, errors={:.4f}".format(
+                Board.format_piece(piece), piece_stats["suboptimal"], piece_stats["errors"]))
+        stats.setdefault("audit", []).append(audit_stats)
+
+    def _get_values(self):
+        return [ArrayValueTable(player.values).array for player in (self.player1, self.player2)]
+
+    def _get_convergence_stats(self, old_values, stats):
+        # A state first seen in this batch counts as changing from the initial value of 0.5
+        deltas = np.concatenate([np.abs(new - np.nan_to_num(old, nan=0.5))[~np.isnan(new)]
+                                 for old, new in zip(old_values, self._get_values())])
+        # The vs_random stats hold the games against whichever opponent was chosen
+        loss_rate = max(stats["compete_x_vs_random"][-1][Board.O],
+                        stats["compete_o_vs_random"][-1][Board.X])/self.num_batches
+        mean_delta = float(deltas.mean()) if len(deltas) else 0.0
+        return {"max_delta": float(deltas.max(initial=0.0)), "mean_delta": mean_delta, "loss_rate": loss_rate}
+
+    def _is_converged(self, old_values, stats):
+        convergence_stats = self._get_convergence_stats(old_values, stats)
+        print("- Convergence: max delta={max_delta:.6f}, mean delta={mean_delta:.6f}, "
+              "loss rate={loss_rate:.4f}".format(**convergence_stats))
+        return all(convergence_stats[key] <= threshold
+                   for key, threshold in self.thresholds.items() if threshold is not None)
 
     def _show_game_numbers(self, game_number):
         print("Game #{}-{}:".format(game_number+1, game_number+self.num_batches))
@@ -71,32 +222,43 @@ class Trainer(object):
         run_if_learner(self.player1, lambda: self.player1.enable_learning())
         run_if_learner(self.player2, lambda: self.player2.enable_learning())
 
-        stats = self._init_stats()
-        for batch_number in range(self.num_batches):
-            winner = self._train_game(player1, player2)
-            stats[winner] += 1
-
+        stats = self._play_batch(player1, player2, self._train_game)
         self._show_stats(stat_type, stats)
         return stats
 
+    def _play_batch(self, player1, player2, play_game):
+        stats = self._init_stats()
+        if self.vectorized:
+            winners = self._play_vectorized_batch(player1, player2)
+            for winner in stats:
+                stats[winner] = int((winners == winner).sum())
+        else:
+            controller = GameController(player1, player2)
+            for batch_number in range(self.num_batches):
+                if self.schedule_by_game:
+                    self._set_schedule_step(self.game_number + batch_number)
+                controller.reset()
+                winner = play_game(controller)
+                stats[winner] += 1
+        return stats
+
+    def _play_vectorized_batch(self, player1, player2):
+        if self.parallel:
+            return self.parallel.play(player1, player2, self.num_batches)
+        return BatchSelfPlay(player1, player2).play(self.num_batches)
+
     def _init_stats(self):
         return {Board.X: 0, Board.O: 0, Board.DRAW: 0}
         
-    def _train_game(self, player1, player2):
-        controller = GameController(player1, player2)
-        winner = None
-        while winner is None:
-            winner, _ = controller.make_move()
-            run_if_learner(player1, lambda: player1.store_state())
-            run_if_learner(player2, lambda: player2.store_state())
-            
-        run_if_learner(player1, lambda: player1.set_reward(winner))
-        run_if_learner(player2, lambda: player2.set_reward(winner))
+    def _train_game(self, controller):
+        winner, _ = controller.play_to_end(store_states=True)
+        for learner in controller.learners:
+            learner.set_reward(winner)
         return winner
 
     def _save_stats(self, stats):
         with open(utils.get_path("data", self.player1.__class__.__name__ + "Stats.pkl"), "wb") as f:
-            params = {"num_games": self.num_games, "num_batches": self.num_batches}
+            params = {"num_games": len(stats["train_self"])*self.num_batches, "num_batches": self.num_batches}
             pickle.dump({"params": params, "stats": stats}, f)
 
     def _show_stats(self, stat_type, stats):
@@ -108,19 +270,12 @@ class Trainer(object):
         run_if_learner(player1, lambda: player1.disable_learning())
         run_if_learner(player2, lambda: player2.disable_learning())
 
-        stats = self._init_stats()
-        for batch_number in range(self.num_batches):
-            winner = self._compete_game(player1, player2)
-            stats[winner] += 1
-
+        stats = self._play_batch(player1, player2, self._compete_game)
         self._show_stats(stat_type, stats)
         return stats
         
-    def _compete_game(self, player1, player2):
-        controller = GameController(player1, player2)
-        winner = None
-        while winner is None:
-            winner, _ = controller.make_move()
+    def _compete_game(self, controller):
+        winner, _ = controller.play_to_end()
         return winner
 
     def save(self, stats):
@@ -2,3 +2,8 @@ import os
 
 def get_path(dirname, filename):
     return os.path.abspath(os.path.join(os.path.dirname(__file__), "..", dirname, filename))
+
+# The number of games for each of num_parts workers, with the remainder spread over the first ones
+def split_games(num_games, num_parts):
+    num_games_per_part, remainder = divmod(num_games, num_parts)
+    return [num_games_per_part + (part < remainder) for part in range(num_parts)]
@@ -0,0 +1,95 @@
+import sys
+import numpy as np
+from multiprocessing import shared_memory, resource_tracker
+from board import Board
+
+def _get_shape(values):
+    # Copies keep the shape of the table they copy, e.g. a value per state and move
+    return values.array.shape if isinstance(values, ArrayValueTable) else (Board.NUM_STATES,)
+
+class ArrayValueTable(object):
+    def __init__(self, values=None, array=None):
+        self.array = np.full(_get_shape(values), np.nan, dtype=np.float32) if array is None else array
+        if isinstance(values, ArrayValueTable):
+            self.array[:] = values.array
+        elif values:
+            self.update(values)
+
+    def get(self, state, default=None):
+        value = float(self.array[state])
+        return default if value != value else value
+
+    def __getitem__(self, state):
+        value = self.get(state)
+        if value is None:
+            raise KeyError(state)
+        return value
+
+    def __setitem__(self, state, value):
+        self.array[state] = value
+
+    def __contains__(self, state):
+        return not np.isnan(self.array[state])
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.array)))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return np.flatnonzero(~np.isnan(self.array)).tolist()
+
+    def items(self):
+        states = np.flatnonzero(~np.isnan(self.array))
+        return list(zip(states.tolist(), self.array[states].tolist()))
+
+    def update(self, values):
+        for state, value in dict(values).items():
+            self.array[state] = value
+
+# Only the creating process tracks a shared block, so it is unlinked if that process exits
+# without unlinking it, but not when a process that attached to it does. Python 3.13 can attach
+# without tracking. Before that, attaching always registers the block with the process's
+# resource tracker, which may be shared with the creator, so registering is skipped rather than
+# undone. This was checked against CPython 3.8 to 3.12, where SharedMemory looks up
+# resource_tracker.register when it is called, and fails with an AttributeError if that goes.
+def _attach_shared_memory(name):
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+# Dense values in a multiprocessing.shared_memory block. Pickling a SharedValueTable only sends
+# the block name, so a worker process that receives one attaches to the same values instead of
+# copying them, and its updates are seen by every other process without locking.
+class SharedValueTable(ArrayValueTable):
+    def __init__(self, values=None, name=None, shape=None):
+        shape = shape or _get_shape(values)
+        if name is None:
+            size = int(np.prod(shape))*np.dtype(np.float32).itemsize
+            self.shared_memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shared_memory = _attach_shared_memory(name)
+        array = np.ndarray(shape, dtype=np.float32, buffer=self.shared_memory.buf)
+        if name is None:
+            array[:] = np.nan
+        super().__init__(values, array)
+
+    def __reduce__(self):
+        return SharedValueTable, (None, self.get_name(), self.array.shape)
+
+    def get_name(self):
+        return self.shared_memory.name
+
+    def close(self):
+        self.array = None
+        self.shared_memory.close()
+
+    def unlink(self):
+        self.close()
+        self.shared_memory.unlink()
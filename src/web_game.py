@@ -14,7 +14,10 @@ class WebGame(Game):
     def start_game(self, player_types_dict):
         self.player1 = self.get_and_load_player(self.player1, player_types_dict["x"], Board.X)
         self.player2 = self.get_and_load_player(self.player2, player_types_dict["o"], Board.O)
-        self.controller = GameController(self.player1, self.player2)
+        if self.controller and self.controller.players == [self.player1, self.player2]:
+            self.controller.reset()
+        else:
+            self.controller = GameController(self.player1, self.player2)
         return self._get_game_info(None)
 
     def _get_game_info(self, winner):
@@ -28,7 +31,7 @@ class WebGame(Game):
 
     def get_and_load_player(self, player, player_type, piece):
         if self.player_types_dict[piece] != player_type:
-            player = super().get_and_load_player(player_type, piece)
+            player = super().get_and_load_player(player_type, piece, shared=True)
             run_if_human(player, lambda: player.set_non_interactive())
             self.player_types_dict[piece] = player_type
         return player
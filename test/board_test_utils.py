@@ -2,7 +2,7 @@ from board import Board
 
 def set_board(board, pieces):
     for index, piece in get_board_state(pieces):
-        board.state[index] = piece
+        board.make_move(index, piece)
 
 def get_board_state(pieces):
     for index, piece in get_index_and_pieces(pieces):
@@ -16,16 +16,22 @@ def get_board_state(pieces):
 def get_board_state_tuple(pieces):
     return tuple(piece for _, piece in get_board_state(pieces))
     
+def get_board_state_key(pieces):
+    return Board.encode_state(get_board_state_tuple(pieces))
+
 def assert_board_state_tuple_is(cls, pieces, state):
     cls.assertEqual(get_board_state_tuple(pieces), state)
 
+def assert_board_state_key_is(cls, pieces, key):
+    cls.assertEqual(get_board_state_key(pieces), key)
+
 def assert_board_is(cls, board, pieces=""):
     expected_board = Board()
     for index, piece in get_index_and_pieces(pieces):
         if piece == "X":
-            expected_board.state[index] = Board.X
+            expected_board.make_move(index, Board.X)
         elif piece == "O":
-            expected_board.state[index] = Board.O
+            expected_board.make_move(index, Board.O)
 
     cls.assertEqual(expected_board.state, board.state)
 
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from io import StringIO
+from mock import patch
+from audit import OptimalityAuditor, audit_player
+from td_learning_player import TDLearningPlayer
+from td_symmetric_learning_player import TDSymmetricLearningPlayer
+from perfect_player import PerfectPlayer
+from board import Board
+
+class TestOptimalityAuditor(unittest.TestCase):
+    def get_player(self, piece, player_class=TDLearningPlayer, seed=0):
+        player = player_class()
+        player.set_piece(piece)
+        player.use_dense_values()
+        player.values.array[:] = np.random.default_rng(seed).random(Board.NUM_STATES)
+        return player
+
+    def get_expected_results(self, player):
+        # One position at a time, with the players' own get_move_values and get_best_moves
+        board = Board()
+        perfect_player = PerfectPlayer()
+        for each_player in (player, perfect_player):
+            each_player.set_board(board)
+        perfect_player.set_piece(player.piece)
+        suboptimal = []
+        errors = []
+        def visit(piece):
+            if piece == player.piece:
+                move_values = player.get_move_values()
+                max_value = max(move_values.values())
+                greedy = [position for position, value in move_values.items() if value == max_value]
+                move_scores = perfect_player.get_move_scores()
+                score = np.sign(max(move_scores.values()))
+                suboptimal.append(np.mean([position not in perfect_player.get_best_moves() for position in greedy]))
+                errors.append(np.mean([np.sign(move_scores[position]) != score for position in greedy]))
+            for position in board.get_available_moves():
+                winner, _ = board.push_move(position, piece)
+                if winner is None and board.key not in visited:
+                    visited.add(board.key)
+                    visit(-piece)
+                board.pop_move(position)
+        visited = set()
+        visit(Board.X)
+        return len(suboptimal), np.mean(suboptimal), np.mean(errors)
+
+    def assert_audit_matches_each_position(self, player):
+        results = audit_player(player)[None]
+        num_positions, suboptimal, errors = self.get_expected_results(player)
+        self.assertEqual(num_positions, results["num_positions"])
+        self.assertAlmostEqual(suboptimal, results["suboptimal"])
+        self.assertAlmostEqual(errors, results["errors"])
+
+    def test_audit_player_matches_each_position_for_x(self):
+        self.assert_audit_matches_each_position(self.get_player(Board.X))
+
+    def test_audit_player_matches_each_position_for_o(self):
+        self.assert_audit_matches_each_position(self.get_player(Board.O, seed=1))
+
+    def test_audit_player_matches_each_position_for_symmetric_player(self):
+        self.assert_audit_matches_each_position(self.get_player(Board.X, TDSymmetricLearningPlayer, seed=2))
+
+    def test_audit_player_breaks_results_down_by_ply(self):
+        x_results = audit_player(self.get_player(Board.X))
+        o_results = audit_player(self.get_player(Board.O))
+        self.assertEqual([0, 2, 4, 6, 8, None], list(x_results))
+        self.assertEqual([1, 3, 5, 7, None], list(o_results))
+        self.assertEqual(4520, x_results[None]["num_positions"] + o_results[None]["num_positions"])
+        self.assertEqual(x_results[None]["num_positions"],
+                         sum(x_results[ply]["num_positions"] for ply in [0, 2, 4, 6, 8]))
+
+    def test_audit_player_weights_tied_greedy_moves_equally(self):
+        # Without values, every move that does not win ties, and on the empty board every move draws
+        player = TDLearningPlayer()
+        player.set_piece(Board.X)
+        player.use_dense_values()
+        results = audit_player(player)
+        self.assertEqual(0.0, results[0]["suboptimal"])
+        self.assertGreater(results[2]["suboptimal"], 0.0)
+        self.assertLess(results[2]["suboptimal"], 1.0)
+
+    @patch('td_learning_player.TDLearningPlayer.load')
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_show_results(self, stdout_mock, load_mock):
+        auditor = OptimalityAuditor([])
+        results = {Board.X: {0: {"num_positions": 1, "suboptimal": 0.0, "errors": 0.0},
+                             None: {"num_positions": 1, "suboptimal": 0.0, "errors": 0.0}},
+                   Board.O: {1: {"num_positions": 9, "suboptimal": 0.5, "errors": 0.25},
+                             None: {"num_positions": 9, "suboptimal": 0.5, "errors": 0.25}}}
+        auditor.show_results(results)
+        self.assertEqual(
+            "X Results:\n"
+            "- Ply 0: 1 positions, 0.00% suboptimal, 0.00% errors\n"
+            "- All: 1 positions, 0.00% suboptimal, 0.00% errors\n"
+            "O Results:\n"
+            "- Ply 1: 9 positions, 50.00% suboptimal, 25.00% errors\n"
+            "- All: 9 positions, 50.00% suboptimal, 25.00% errors\n",
+            stdout_mock.getvalue())
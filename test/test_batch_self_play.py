@@ -0,0 +1,202 @@
+import unittest
+import numpy as np
+from batch_self_play import BatchSelfPlay
+from td_learning_player import TDLearningPlayer
+from td_symmetric_learning_player import TDSymmetricLearningPlayer
+from td_lambda_learning_player import TDLambdaLearningPlayer
+from random_player import RandomPlayer
+from q_learning_player import QLearningPlayer
+from perfect_player import PerfectPlayer
+from board import Board
+from board_test_utils import get_board_state_key
+
+class TestBatchSelfPlay(unittest.TestCase):
+    def setUp(self):
+        self.player1 = TDLearningPlayer()
+        self.player2 = TDLearningPlayer()
+        self.player1.use_dense_values()
+        self.player2.use_dense_values()
+        self.batch = BatchSelfPlay(self.player1, self.player2, seed=1)
+
+    def assert_winners_are_valid(self, winners, num_games):
+        self.assertEqual(num_games, len(winners))
+        self.assertTrue(np.isin(winners, [Board.X, Board.O, Board.DRAW]).all())
+
+    def test_constructor_sets_pieces(self):
+        self.assertEqual(Board.X, self.player1.piece)
+        self.assertEqual(Board.O, self.player2.piece)
+
+    def test_play_random_players(self):
+        batch = BatchSelfPlay(RandomPlayer(), RandomPlayer(), seed=2)
+        self.assert_winners_are_valid(batch.play(500), 500)
+
+    def test_play_perfect_players_always_draws(self):
+        batch = BatchSelfPlay(PerfectPlayer(), PerfectPlayer(), seed=4)
+        np.testing.assert_array_equal(np.full(200, Board.DRAW), batch.play(200))
+
+    def test_play_perfect_player_never_loses_to_random_player(self):
+        batch = BatchSelfPlay(RandomPlayer(), PerfectPlayer(), seed=5)
+        self.assertFalse((batch.play(500) == Board.X).any())
+
+    def test_play_is_reproducible_with_seed(self):
+        batch1 = BatchSelfPlay(RandomPlayer(), RandomPlayer(), seed=3)
+        batch2 = BatchSelfPlay(RandomPlayer(), RandomPlayer(), seed=3)
+        np.testing.assert_array_equal(batch1.play(100), batch2.play(100))
+
+    def test_play_chooses_best_moves_if_learning_disabled(self):
+        self.player1.disable_learning()
+        self.player2.disable_learning()
+        for pieces in ["X--|---|---", "X--|-X-|-O-", "XO-|-X-|-OX"]:
+            self.player1.values[get_board_state_key(pieces)] = 0.9
+        for pieces in ["X--|---|-O-", "XO-|-X-|-O-"]:
+            self.player2.values[get_board_state_key(pieces)] = 0.9
+
+        np.testing.assert_array_equal([Board.X]*10, self.batch.play(10))
+        self.assertEqual(5, self.player1.get_num_states() + self.player2.get_num_states())
+
+    def test_play_learns_values_if_learning_enabled(self):
+        self.player1.enable_learning()
+        self.player2.enable_learning()
+        self.assert_winners_are_valid(self.batch.play(1000), 1000)
+        self.assertGreater(self.player1.get_num_states(), 100)
+        self.assertGreater(self.player2.get_num_states(), 100)
+        self.assertAlmostEqual(1.0, self.player1.values[get_board_state_key("XXX|OO-|---")])
+        self.assertAlmostEqual(0.0, self.player2.values[get_board_state_key("XXX|OO-|---")])
+
+    def test_set_rewards_updates_values_like_set_reward(self):
+        self.player1.set_params(alpha=0.4)
+        pieces_list = ["X--|---|---", "XO-|---|---", "XO-|X--|---", "XO-|XO-|---", "XO-|XO-|X--"]
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, :5] = list(map(get_board_state_key, pieces_list))
+        self.batch._set_rewards(self.player1, history, np.array([5]), np.array([Board.X]))
+        for pieces, value in zip(pieces_list, [0.5128, 0.532, 0.58, 0.7, 1.0]):
+            self.assertAlmostEqual(value, self.player1.values[get_board_state_key(pieces)])
+
+    def test_set_rewards_uses_lambda_returns_for_td_lambda_learner(self):
+        player = TDLambdaLearningPlayer()
+        player.set_params(**{"alpha": 0.4, "lambda": 0.5})
+        player.use_dense_values()
+        BatchSelfPlay(player, RandomPlayer())
+        pieces_list = ["X--|---|---", "XO-|---|---", "XO-|X--|---", "XO-|XO-|---", "XO-|XO-|X--"]
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, :5] = list(map(get_board_state_key, pieces_list))
+        self.batch._set_rewards(player, history, np.array([5]), np.array([Board.X]))
+        for pieces, value in zip(pieces_list, [0.5686, 0.598, 0.64, 0.7, 1.0]):
+            self.assertAlmostEqual(value, player.values[get_board_state_key(pieces)])
+
+    def test_set_q_rewards_updates_values_like_set_reward(self):
+        pieces_list = ["X--|---|---", "XO-|---|---", "XO-|X--|---", "XO-|XO-|---", "XO-|XO-|X--"]
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, :5] = list(map(get_board_state_key, pieces_list))
+        moves = np.zeros((1, 9), dtype=np.int64)
+        moves[0, :5] = [0, 1, 3, 4, 6]
+        for piece in [Board.X, Board.O]:
+            batch_player = QLearningPlayer()
+            player = QLearningPlayer()
+            for each_player in (batch_player, player):
+                each_player.set_piece(piece)
+                each_player.set_params(alpha=0.4, count_visits=True)
+                each_player.enable_learning()
+            self.batch._set_q_rewards(batch_player, history, moves, np.array([5]), np.array([Board.X]))
+            player.states = list(history[0, :5])
+            player.set_reward(Board.X)
+            np.testing.assert_allclose(player.values.array, batch_player.values.array)
+            np.testing.assert_array_equal(player.visits, batch_player.visits)
+
+    def test_set_q_rewards_uses_same_visit_alpha_as_set_reward(self):
+        # Two games with the same first move, won and then lost, average to 0.5 with 1/N(s, a)
+        batch_player = QLearningPlayer()
+        player = QLearningPlayer()
+        for each_player in (batch_player, player):
+            each_player.set_params(alpha=0.01, visit_alpha=True)
+            each_player.set_piece(Board.X)
+            each_player.enable_learning()
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, :2] = [get_board_state_key("X--|---|---"), get_board_state_key("XO-|---|---")]
+        moves = np.zeros((1, 9), dtype=np.int64)
+        moves[0, :2] = [0, 1]
+        for winner in [Board.X, Board.O]:
+            self.batch._set_q_rewards(batch_player, history, moves, np.array([2]), np.array([winner]))
+            player.reset()
+            player.states = list(history[0, :2])
+            player.set_reward(winner)
+        self.assertAlmostEqual(0.5, player.values.array[0, 0])
+        np.testing.assert_allclose(player.values.array, batch_player.values.array)
+        np.testing.assert_array_equal(player.visits, batch_player.visits)
+
+    def test_set_q_rewards_uses_visit_alpha_of_each_move(self):
+        # Moves 0 and 1 from the empty board, won and lost, and move 0 again, lost, in one batch
+        player = QLearningPlayer()
+        player.set_params(alpha=0.01, visit_alpha=True)
+        player.set_piece(Board.X)
+        player.enable_learning()
+        history = np.zeros((3, 9), dtype=np.int64)
+        history[:, 0] = [get_board_state_key(pieces) for pieces in ["X--|---|---", "-X-|---|---", "X--|---|---"]]
+        moves = np.zeros((3, 9), dtype=np.int64)
+        moves[:, 0] = [0, 1, 0]
+        self.batch._set_q_rewards(player, history, moves, np.array([1, 1, 1]),
+                                  np.array([Board.X, Board.O, Board.O]))
+        self.assertAlmostEqual(0.5, player.values.array[0, 0])
+        self.assertAlmostEqual(0.0, player.values.array[0, 1])
+        self.assertEqual([2, 1], player.visits[0, :2].tolist())
+
+    def test_play_learns_q_values(self):
+        player1 = QLearningPlayer()
+        player2 = QLearningPlayer()
+        player1.enable_learning()
+        player2.enable_learning()
+        BatchSelfPlay(player1, player2, seed=6).play(200)
+        self.assertTrue((~np.isnan(player1.values.array[0])).all())
+        self.assertGreater(player2.get_num_states(), 50)
+
+    def test_set_rewards_counts_visits_and_uses_visit_alpha(self):
+        self.player1.set_params(alpha=0.1, visit_alpha=True)
+        history = np.zeros((2, 9), dtype=np.int64)
+        history[:, 0] = get_board_state_key("---|-X-|---")
+        history[:, 1] = get_board_state_key("X--|-X-|---")
+        self.player1.values[history[0, 1]] = 1.0
+        self.batch._set_rewards(self.player1, history, np.array([2, 2]), np.array([Board.X, Board.X]))
+        self.assertEqual(2, self.player1.visits[history[0, 0]])
+        self.assertEqual(0, self.player1.visits[history[0, 1]])
+        self.assertAlmostEqual(1.0, self.player1.values[history[0, 0]])
+
+    def test_set_rewards_uses_same_visit_alpha_as_set_reward(self):
+        # Two games through the same state, towards 1.0 and then 0.0, average to 0.5 with 1/N(s)
+        player = TDLearningPlayer()
+        for each_player in (self.player1, player):
+            each_player.set_params(alpha=0.01, visit_alpha=True)
+            each_player.set_piece(Board.X)
+            each_player.enable_learning()
+        states = [get_board_state_key("---|-X-|---"), get_board_state_key("X--|-X-|---")]
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, :2] = states
+        for target in [1.0, 0.0]:
+            for each_player in (self.player1, player):
+                each_player.values[states[1]] = target
+            self.batch._set_rewards(self.player1, history, np.array([2]), np.array([Board.X]))
+            player.reset()
+            player.states = list(states)
+            player.set_reward(Board.X)
+        self.assertAlmostEqual(0.5, player.values[states[0]])
+        self.assertAlmostEqual(player.values[states[0]], self.player1.values[states[0]])
+        np.testing.assert_array_equal(player.visits, self.player1.visits)
+
+    def test_set_rewards_averages_updates_to_same_state(self):
+        self.player1.set_params(alpha=0.5)
+        history = np.zeros((2, 9), dtype=np.int64)
+        history[:, 0] = get_board_state_key("---|-X-|---")
+        history[0, 1] = get_board_state_key("X--|-X-|---")
+        history[1, 1] = get_board_state_key("--X|-X-|---")
+        self.player1.values[history[0, 1]] = 1.0
+        self.player1.values[history[1, 1]] = 0.0
+        self.batch._set_rewards(self.player1, history, np.array([2, 2]), np.array([Board.X, Board.O]))
+        self.assertAlmostEqual(0.5, self.player1.values[get_board_state_key("---|-X-|---")])
+
+    def test_set_rewards_stores_canonical_states_for_symmetric_learner(self):
+        player = TDSymmetricLearningPlayer()
+        player.use_dense_values()
+        BatchSelfPlay(player, RandomPlayer())
+        history = np.zeros((1, 9), dtype=np.int64)
+        history[0, 0] = get_board_state_key("--X|---|---")
+        self.batch._set_rewards(player, history, np.array([1]), np.array([Board.X]))
+        self.assertEqual([get_board_state_key("X--|---|---")], player.values.keys())
@@ -1,7 +1,8 @@
 import unittest
+import random
 from board import Board
 from board_test_utils import (set_board, assert_board_is, get_index_and_pieces, 
-                              get_expected_formatted_board, assert_board_state_tuple_is)
+                              get_expected_formatted_board, assert_board_state_key_is)
 
 class TestBoard(unittest.TestCase):
     def setUp(self):
@@ -33,12 +34,20 @@ class TestBoard(unittest.TestCase):
         set_board(self.board, pieces)
         self.assertEqual(winner, self.board.get_winner())
         
+    def scan_for_winner(self):
+        state = self.board.state
+        for line in Board.WINNING_LINES:
+            pieces = set(state[position] for position in line)
+            if len(pieces) == 1 and Board.EMPTY not in pieces:
+                return pieces.pop()
+        return Board.DRAW if Board.EMPTY not in state else None
+
     def assert_try_move_is(self, expected_winner, pieces_before, pieces_after, position, piece):
         set_board(self.board, pieces_before)
         with self.board.try_move(position, piece) as (winner, state):
             self.assertEqual(expected_winner, winner)
             assert_board_is(self, self.board, pieces_after)
-            assert_board_state_tuple_is(self, pieces_after, state)
+            assert_board_state_key_is(self, pieces_after, state)
         assert_board_is(self, self.board, pieces_before)
 
     def assert_board_format_is(self, formatted_pieces, pieces=""):
@@ -71,6 +80,42 @@ class TestBoard(unittest.TestCase):
         self.assert_board_is_after_move("XOX|OXO|XO-", 7, Board.O)
         self.assert_board_is_after_move("XOX|OXO|XOX", 8, Board.X)
 
+    def test_make_move_with_empty_piece_clears_position(self):
+        set_board(self.board, "XO-|---|---")
+        self.board.make_move(1, Board.EMPTY)
+        assert_board_is(self, self.board, "X--|---|---")
+        self.assertEqual(8, self.board.num_empty)
+
+    def test_num_empty_tracks_moves(self):
+        self.assertEqual(9, self.board.num_empty)
+        self.board.make_move(4, Board.X)
+        self.board.make_move(0, Board.O)
+        self.assertEqual(7, self.board.num_empty)
+        self.board.make_move(0, Board.X)
+        self.assertEqual(7, self.board.num_empty)
+
+    def test_key_tracks_moves(self):
+        self.assertEqual(0, self.board.key)
+        self.board.make_move(0, Board.X)
+        self.board.make_move(2, Board.O)
+        assert_board_state_key_is(self, "X-O|---|---", self.board.key)
+        self.board.make_move(0, Board.EMPTY)
+        assert_board_state_key_is(self, "--O|---|---", self.board.key)
+
+    def test_encode_state(self):
+        self.assertEqual(0, Board.encode_state([Board.EMPTY]*9))
+        self.assertEqual(1 + 2*3**8, Board.encode_state([Board.X] + [Board.EMPTY]*7 + [Board.O]))
+
+    def test_decode_state(self):
+        state = (Board.X, Board.O, Board.EMPTY, Board.O, Board.X, Board.EMPTY, Board.EMPTY, Board.X, Board.O)
+        self.assertEqual(state, Board.decode_state(Board.encode_state(state)))
+
+    def test_get_piece(self):
+        set_board(self.board, "X-O|---|---")
+        self.assertEqual(Board.X, self.board.get_piece(0))
+        self.assertEqual(Board.EMPTY, self.board.get_piece(1))
+        self.assertEqual(Board.O, self.board.get_piece(2))
+
     def test_get_available_moves_returns_all_moves_if_empty(self):
         self.assert_get_available_moves_are(list(range(9)))
 
@@ -230,6 +275,33 @@ class TestBoard(unittest.TestCase):
         self.assert_winner_is(Board.DRAW, "XOX|XOO|OXX")
         self.assert_winner_is(Board.DRAW, "XXO|OXX|XOO")
 
+    def test_get_winner_clears_win_when_winning_move_undone(self):
+        set_board(self.board, "XXX|OO-|---")
+        self.board.make_move(2, Board.EMPTY)
+        self.assertEqual(None, self.board.get_winner())
+        self.assertEqual([], self.board.get_winning_positions())
+
+    def test_get_winner_tracks_overwritten_position(self):
+        set_board(self.board, "XXX|OO-|---")
+        self.board.make_move(2, Board.O)
+        self.assertEqual(None, self.board.get_winner())
+        self.board.make_move(5, Board.O)
+        self.assertEqual(Board.O, self.board.get_winner())
+        self.assertEqual([3, 4, 5], self.board.get_winning_positions())
+
+    def test_get_winner_keeps_other_winning_line_when_one_is_broken(self):
+        set_board(self.board, "XXX|X--|X--")
+        self.assertEqual([0, 1, 2], self.board.get_winning_positions())
+        self.board.make_move(1, Board.EMPTY)
+        self.assertEqual(Board.X, self.board.get_winner())
+        self.assertEqual([0, 3, 6], self.board.get_winning_positions())
+
+    def test_get_winner_matches_full_scan_after_random_moves(self):
+        rng = random.Random(0)
+        for _ in range(1000):
+            self.board.make_move(rng.randrange(9), rng.choice([Board.EMPTY, Board.X, Board.O]))
+            self.assertEqual(self.scan_for_winner(), self.board.get_winner())
+
     def test_is_valid_move_returns_false_if_game_over(self):
         self.assert_move_is_invalid(8, "-XO|-XO|-X-")
         
@@ -245,6 +317,39 @@ class TestBoard(unittest.TestCase):
     def test_try_move_indicates_draw_when_draw(self):
         self.assert_try_move_is(Board.DRAW, "OXO|XXO|OO-", "OXO|XXO|OOX", 8, Board.X)
 
+    def test_push_move_returns_winner_and_key(self):
+        set_board(self.board, "X-O|XO-|---")
+        winner, key = self.board.push_move(6, Board.X)
+        self.assertEqual(Board.X, winner)
+        assert_board_state_key_is(self, "X-O|XO-|X--", key)
+        assert_board_is(self, self.board, "X-O|XO-|X--")
+
+    def test_pop_move_restores_board(self):
+        set_board(self.board, "--O|X-X|OX-")
+        self.board.push_move(4, Board.O)
+        self.board.pop_move(4)
+        assert_board_is(self, self.board, "--O|X-X|OX-")
+        assert_board_state_key_is(self, "--O|X-X|OX-", self.board.key)
+        self.assertEqual(4, self.board.num_empty)
+        self.assertEqual(None, self.board.get_winner())
+
+    def test_get_winner_after_move_leaves_board_unchanged(self):
+        set_board(self.board, "OXO|XXO|OO-")
+        self.assertEqual(Board.DRAW, self.board.get_winner_after_move(8, Board.X))
+        self.assertEqual(Board.O, self.board.get_winner_after_move(8, Board.O))
+        set_board(self.board, "X-O|XO-|---")
+        self.assertEqual(Board.X, self.board.get_winner_after_move(6, Board.X))
+        self.assertEqual(None, self.board.get_winner_after_move(7, Board.X))
+        assert_board_is(self, self.board, "X-O|XO-|---")
+
+    def test_reset_clears_board(self):
+        set_board(self.board, "XXX|OO-|---")
+        self.board.reset()
+        assert_board_is(self, self.board, "---|---|---")
+        self.assertEqual(0, self.board.key)
+        self.assertEqual(9, self.board.num_empty)
+        self.assertEqual(None, self.board.get_winner())
+
     def test_get_winner_text(self):
         self.assertEqual(None, Board.get_winner_text(None))
         self.assertEqual("X Wins", Board.get_winner_text(Board.X))
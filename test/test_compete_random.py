@@ -0,0 +1,157 @@
+import unittest
+import numpy as np
+from collections import Counter
+from io import StringIO
+from mock import patch
+from compete_random import CompeteRandom
+from board import Board
+from board_test_utils import set_board, assert_board_is
+
+class TestCompeteRandom(unittest.TestCase):
+    @patch('td_learning_player.TDLearningPlayer.load')
+    def setUp(self, load_mock):
+        self.competer = CompeteRandom(["--exact", "--num-games", "4"])
+        self.competer.player1.set_piece(Board.X)
+        self.competer.player2.set_piece(Board.O)
+
+    def set_distinct_values(self):
+        for seed, player in enumerate([self.competer.player1, self.competer.player2]):
+            player.use_dense_values()
+            player.values.array[:] = np.random.default_rng(seed).random(Board.NUM_STATES)
+
+    def assert_probabilities_are(self, probabilities, results):
+        for piece in [Board.X, Board.O, Board.DRAW]:
+            self.assertAlmostEqual(probabilities[piece], results["probabilities"][piece])
+
+    def test_compete_exact_probabilities_sum_to_one(self):
+        self.set_distinct_values()
+        results = self.competer.compete()
+        for piece in [Board.X, Board.O]:
+            self.assertAlmostEqual(1.0, sum(results[piece]["probabilities"].values()))
+
+    def test_compete_exact_losing_moves_add_up_to_loss_probability(self):
+        self.set_distinct_values()
+        results = self.competer.compete()
+        self.assertAlmostEqual(
+            results[Board.X]["probabilities"][Board.O], sum(results[Board.X]["losing_moves"].values()))
+        self.assertAlmostEqual(
+            results[Board.O]["probabilities"][Board.X], sum(results[Board.O]["losing_moves"].values()))
+
+    def test_enumerate_games_weights_random_and_tied_best_moves_equally(self):
+        board = Board()
+        set_board(board, "XX-|OO-|XO-")
+        player = self.competer.player2
+        player.set_board(board)
+        self.competer.opponent.set_board(board)
+        results = self.competer._init_exact_results()
+        self.competer._enumerate_games(player, Board.X, board, Board.X, 1.0, [], results)
+        self.assert_probabilities_are({Board.X: 1/2, Board.O: 1/3, Board.DRAW: 1/6}, results)
+        self.assertEqual([(2,), (5, 8, 2)], sorted(results["losing_moves"]))
+        self.assertAlmostEqual(1/3, results["losing_moves"][(2,)])
+        self.assertAlmostEqual(1/6, results["losing_moves"][(5, 8, 2)])
+        assert_board_is(self, board, "XX-|OO-|XO-")
+
+    def test_enumerate_games_chooses_best_moves(self):
+        board = Board()
+        set_board(board, "XOX|OXO|O--")
+        player = self.competer.player1
+        player.set_board(board)
+        self.competer.opponent.set_board(board)
+        results = self.competer._init_exact_results()
+        self.competer._enumerate_games(player, Board.O, board, Board.X, 1.0, [], results)
+        self.assert_probabilities_are({Board.X: 1.0, Board.O: 0.0, Board.DRAW: 0.0}, results)
+        self.assertEqual({}, results["losing_moves"])
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_workers_must_be_at_least_one(self, stderr_mock):
+        self.assertRaises(SystemExit, CompeteRandom, ["--workers", "0"])
+        self.assertIn("--workers must be at least 1", stderr_mock.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_compete_exact_needs_deterministic_opponent(self, stderr_mock):
+        self.assertRaises(SystemExit, CompeteRandom, ["--exact", "--opponent", "MCTS"])
+        self.assertIn("can only enumerate games against Minimax, Perfect or Random opponents",
+                      stderr_mock.getvalue())
+
+    @patch('td_learning_player.TDLearningPlayer.load')
+    def test_compete_exact_against_minimax_never_wins(self, load_mock):
+        self.competer = CompeteRandom(["--exact", "--opponent", "Minimax"])
+        self.competer.player1.set_piece(Board.X)
+        self.competer.player2.set_piece(Board.O)
+        self.set_distinct_values()
+        results = self.competer.compete()
+        self.assertAlmostEqual(0.0, results[Board.X]["probabilities"][Board.X])
+        self.assertAlmostEqual(0.0, results[Board.O]["probabilities"][Board.O])
+
+    @patch('compete_random.utils.get_path')
+    @patch('compete_random.pickle.dump')
+    def test_save_results_names_file_after_non_random_opponent(self, dump_mock, get_path_mock):
+        get_path_mock.return_value = "/dev/null"
+        self.competer.save_results({})
+        self.competer.opponent_type = "Minimax"
+        self.competer.save_results({})
+        self.assertEqual(
+            ["TDLearningPlayerLosingResults.pkl", "TDLearningPlayerLosingResultsVsMinimax.pkl"],
+            [args[1] for args, _ in get_path_mock.call_args_list])
+
+    @patch('compete_random.CompeteRandom._compete_game')
+    def test_compete_sampled_counts_each_losing_sequence(self, compete_game_mock):
+        self.competer.exact = False
+        compete_game_mock.side_effect = [
+            (Board.O, [0, 4, 1, 2, 3, 6]), (Board.X, [0, 4, 8, 2, 6, 3, 7]),
+            (Board.O, [0, 4, 1, 2, 3, 6]), (Board.DRAW, [4, 0, 8, 2, 1, 7, 6, 3, 5]),
+            (Board.O, [1, 4, 0, 2, 3, 6]), (Board.X, [0, 4, 8, 2, 6, 3, 7]),
+            (Board.X, [4, 0, 8, 2, 1]), (Board.X, [4, 0, 8, 2, 1])]
+        with patch('sys.stdout', new_callable=StringIO):
+            results = self.competer.compete()
+        self.assertEqual(3, results[Board.X]["num_losses"])
+        self.assertEqual(Counter({(0, 4, 1, 2, 3, 6): 2, (1, 4, 0, 2, 3, 6): 1}), results[Board.X]["losing_moves"])
+        self.assertEqual(3, results[Board.O]["num_losses"])
+        self.assertEqual(Counter({(0, 4, 8, 2, 6, 3, 7): 2, (4, 0, 8, 2, 1): 1}), results[Board.O]["losing_moves"])
+
+    def test_merge_results_adds_losses_and_losing_moves(self):
+        results = {Board.X: self.competer._init_results(), Board.O: self.competer._init_results()}
+        for losing_moves in [Counter({(0, 1): 2}), Counter({(0, 1): 1, (2, 3): 1})]:
+            shard_results = {Board.X: {"num_losses": sum(losing_moves.values()), "losing_moves": losing_moves},
+                             Board.O: self.competer._init_results()}
+            self.competer._merge_results(results, shard_results)
+        self.assertEqual(4, results[Board.X]["num_losses"])
+        self.assertEqual(Counter({(0, 1): 3, (2, 3): 1}), results[Board.X]["losing_moves"])
+        self.assertEqual(self.competer._init_results(), results[Board.O])
+
+    def test_compete_sampled_with_workers_is_reproducible(self):
+        self.set_distinct_values()
+        self.competer.exact = False
+        self.competer.num_games = 50
+        self.competer.num_workers = 2
+        self.competer.seed = 1
+        with patch('sys.stdout', new_callable=StringIO):
+            results = [self.competer.compete() for _ in range(2)]
+        self.assertEqual(results[0], results[1])
+
+    def test_get_losing_prefixes_adds_up_weights_of_openings(self):
+        losing_moves = Counter({(0, 4, 1, 2, 3, 6): 2, (0, 1, 4, 2, 3, 6): 1, (1, 4, 0, 2, 3, 6): 3})
+        self.assertEqual(
+            Counter({(0,): 3, (0, 4): 2, (0, 1): 1, (1,): 3, (1, 4): 3}),
+            self.competer._get_losing_prefixes(losing_moves))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_show_results_shows_openings_that_lose_most_first(self, stdout_mock):
+        self.competer.exact = False
+        self.competer.prefix_depth = 1
+        losing_moves = Counter({(0, 4, 1, 2, 3, 6): 2, (1, 4, 0, 2, 3, 6): 3})
+        results = {Board.X: {"num_losses": 5, "losing_moves": losing_moves},
+                   Board.O: {"num_losses": 0, "losing_moves": Counter()}}
+        self.competer.show_results(results)
+        self.assertEqual(
+            "X Results:\n"
+            "- Losses: 5 (125.0%)\n"
+            "- Losing openings:\n"
+            "- - 1 (3)\n"
+            "- - 0 (2)\n"
+            "- Losing moves:\n"
+            "- - 1, 4, 0, 2, 3, 6 (3)\n"
+            "- - 0, 4, 1, 2, 3, 6 (2)\n"
+            "O Results:\n"
+            "- Losses: 0 (0.0%)\n",
+            stdout_mock.getvalue())
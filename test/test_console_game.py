@@ -5,8 +5,13 @@ from io import StringIO
 from board import Board
 from human_player import HumanPlayer
 from random_player import RandomPlayer
+from minimax_player import MinimaxPlayer
+from mcts_player import MCTSPlayer
+from perfect_player import PerfectPlayer
 from td_learning_player import TDLearningPlayer
 from td_symmetric_learning_player import TDSymmetricLearningPlayer
+from td_lambda_learning_player import TDLambdaLearningPlayer
+from q_learning_player import QLearningPlayer
 from learning_computer_player import LearningComputerPlayer
 from console_game import ConsoleGame, main
 from board_test_utils import get_expected_formatted_board
@@ -259,27 +264,61 @@ Select action:
             menu_items=[" 1 "],
             player_class=HumanPlayer)
 
-    def test_select_player_for_o_random(self):
+    def test_select_player_for_o_mcts(self):
         self.assert_select_player_selects(
             piece=Board.O,
             menu_items=["2"],
+            player_class=MCTSPlayer)
+
+    def test_select_player_for_x_minimax(self):
+        self.assert_select_player_selects(
+            piece=Board.X,
+            menu_items=["3"],
+            player_class=MinimaxPlayer)
+
+    def test_select_player_for_o_perfect(self):
+        self.assert_select_player_selects(
+            piece=Board.O,
+            menu_items=["4"],
+            player_class=PerfectPlayer)
+
+    @patch('q_learning_player.QLearningPlayer.load')
+    def test_select_player_for_o_q_learning_player_loads_values(self, load_mock):
+        self.assert_select_player_selects(
+            piece=Board.O,
+            menu_items=["5"],
+            player_class=QLearningPlayer)
+        load_mock.assert_called_once_with(Board.O, False)
+
+    def test_select_player_for_o_random(self):
+        self.assert_select_player_selects(
+            piece=Board.O,
+            menu_items=["6"],
             player_class=RandomPlayer)
 
     @patch('td_learning_player.TDLearningPlayer.load')
     def test_select_player_for_x_td_learning_player_loads_values(self, load_mock):
         self.assert_select_player_selects(
             piece=Board.X,
-            menu_items=["3"],
+            menu_items=["7"],
             player_class=TDLearningPlayer)
-        load_mock.assert_called_once_with(Board.X)
+        load_mock.assert_called_once_with(Board.X, False)
+
+    @patch('td_lambda_learning_player.TDLambdaLearningPlayer.load')
+    def test_select_player_for_o_td_lambda_learning_player_loads_values(self, load_mock):
+        self.assert_select_player_selects(
+            piece=Board.O,
+            menu_items=["8"],
+            player_class=TDLambdaLearningPlayer)
+        load_mock.assert_called_once_with(Board.O, False)
 
     @patch('td_symmetric_learning_player.TDSymmetricLearningPlayer.load')
     def test_select_player_for_x_td_symmetric_learning_player_loads_values(self, load_mock):
         self.assert_select_player_selects(
             piece=Board.X,
-            menu_items=["4"],
-            player_class=TDLearningPlayer)
-        load_mock.assert_called_once_with(Board.X)
+            menu_items=["9"],
+            player_class=TDSymmetricLearningPlayer)
+        load_mock.assert_called_once_with(Board.X, False)
 
     def test_select_player_indicates_invalid_selection(self):
         self.assert_select_player_selects(
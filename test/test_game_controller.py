@@ -24,11 +24,15 @@ class MockLearningComputerPlayer(LearningComputerPlayer):
     def __init__(self):
         super().__init__()
         self.reset_called = False
+        self.stored_states = []
 
     def reset(self):
         super().reset()
         self.reset_called = True
 
+    def store_state(self):
+        self.stored_states.append(self.board.key)
+
 class TestGameController(unittest.TestCase):
     def setUp(self):
         self.player1 = MockPlayer()
@@ -71,6 +75,55 @@ class TestGameController(unittest.TestCase):
         self.assertTrue(player1.reset_called)
         self.assertTrue(player2.reset_called)
 
+    def test_reset_clears_board_and_starts_with_x(self):
+        board = self.controller.board
+        self.player1.set_moves([4])
+        self.controller.make_move()
+        self.controller.reset()
+        self.assertIs(board, self.controller.board)
+        assert_board_is(self, self.controller.board, "---|---|---")
+        self.assertEqual(0, self.controller.player_number)
+
+    def test_reset_resets_learning_player(self):
+        player1 = MockLearningComputerPlayer()
+        player2 = MockLearningComputerPlayer()
+        controller = GameController(player1, player2)
+        player1.reset_called = False
+        controller.reset()
+        self.assertTrue(player1.reset_called)
+
+    def test_play_to_end_returns_winner_and_moves(self):
+        self.player1.set_moves([6, 8, 7])
+        self.player2.set_moves([2, 1])
+        self.assertEqual((Board.X, [6, 2, 8, 1, 7]), self.controller.play_to_end())
+        assert_board_is(self, self.controller.board, "-OO|---|XXX")
+        self.assertEqual(1, self.controller.player_number)
+
+    def test_play_to_end_finishes_started_game(self):
+        self.player1.set_moves([0, 1, 3, 5, 8])
+        self.player2.set_moves([2, 4, 6, 7])
+        self.controller.make_move()
+        self.assertEqual((Board.O, [2, 1, 4, 3, 6]), self.controller.play_to_end())
+
+    def test_play_to_end_stores_states_of_learning_players(self):
+        player1 = MockLearningComputerPlayer()
+        player2 = MockPlayer()
+        player1.get_move = lambda: player1.board.get_available_moves()[0]
+        player2.set_moves([4, 5, 7])
+        controller = GameController(player1, player2)
+        winner, moves = controller.play_to_end(store_states=True)
+        self.assertEqual([0, 4, 1, 5, 2], moves)
+        self.assertEqual(5, len(player1.stored_states))
+        self.assertEqual(controller.board.key, player1.stored_states[-1])
+
+    def test_play_to_end_does_not_store_states_by_default(self):
+        player1 = MockLearningComputerPlayer()
+        player2 = MockPlayer()
+        player1.get_move = lambda: player1.board.get_available_moves()[0]
+        player2.set_moves([4, 5, 7])
+        GameController(player1, player2).play_to_end()
+        self.assertEqual([], player1.stored_states)
+
     def test_get_player(self):
         self.assert_player_is(0, self.player1)
         self.assert_player_is(1, self.player2)
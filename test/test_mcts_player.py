@@ -0,0 +1,97 @@
+import unittest
+import random
+import itertools
+from mock import patch
+from mcts_player import MCTSPlayer, MCTSNode
+from board import Board
+from random_player import RandomPlayer
+from game_controller import GameController
+from board_test_utils import set_board, assert_board_is, get_board_state_key
+
+class TestMCTSPlayer(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.player = MCTSPlayer(num_playouts=500)
+        self.board = Board()
+        self.player.set_board(self.board)
+
+    def test_constructor_needs_a_budget(self):
+        self.assertRaises(ValueError, MCTSPlayer, num_playouts=None)
+        MCTSPlayer(num_playouts=None, time_limit=0.01)
+
+    def test_get_move_takes_win(self):
+        self.player.set_piece(Board.X)
+        set_board(self.board, "XX-|OO-|---")
+        self.assertEqual(2, self.player.get_move())
+
+    def test_get_move_blocks_loss(self):
+        self.player.set_piece(Board.X)
+        set_board(self.board, "X--|OO-|--X")
+        self.assertEqual(5, self.player.get_move())
+
+    def test_search_leaves_board_unchanged(self):
+        self.player.set_piece(Board.O)
+        set_board(self.board, "X--|-O-|--X")
+        self.player.get_best_moves()
+        assert_board_is(self, self.board, "X--|-O-|--X")
+        self.assertIsNone(self.board.get_winner())
+
+    def test_search_plays_budget_of_playouts(self):
+        self.player.set_piece(Board.X)
+        self.player.get_best_moves()
+        self.assertEqual(500, self.player.root.visits)
+        self.assertEqual(500, sum(child.visits for child in self.player.root.children.values()))
+
+    def search(self, player):
+        player.root = player._find_root()
+        return player.search()
+
+    def test_search_tries_every_move_even_if_out_of_time(self):
+        player = MCTSPlayer(num_playouts=None, time_limit=0.0)
+        player.set_board(self.board)
+        player.set_piece(Board.X)
+        self.assertEqual(9, self.search(player))
+        self.assertEqual(list(range(9)), sorted(player.root.children))
+
+    @patch('mcts_player.time.perf_counter')
+    def test_search_stops_at_time_limit(self, perf_counter_mock):
+        perf_counter_mock.side_effect = itertools.count()
+        player = MCTSPlayer(num_playouts=None, time_limit=20.0)
+        player.set_board(self.board)
+        player.set_piece(Board.X)
+        # The deadline is set at time 0, and each check after the first 9 playouts takes a tick
+        self.assertEqual(9 + 19, self.search(player))
+
+    def test_get_move_reuses_subtree_of_opponent_reply(self):
+        self.player.set_piece(Board.X)
+        position = self.player.get_move()
+        self.board.make_move(position, Board.X)
+        reply = next(move for move in self.board.get_available_moves() if move in self.player.root.children)
+        subtree = self.player.root.children[reply]
+        visits = subtree.visits
+        self.board.make_move(reply, Board.O)
+        position = self.player.get_move()
+        self.assertIs(subtree.children[position], self.player.root)
+        self.assertEqual(visits + 500, subtree.visits)
+
+    def test_find_root_starts_new_tree_for_unknown_board(self):
+        self.player.set_piece(Board.X)
+        self.player.get_move()
+        self.board.reset()
+        set_board(self.board, "-O-|---|---")
+        root = self.player._find_root()
+        self.assertEqual(get_board_state_key("-O-|---|---"), root.key)
+        self.assertEqual(0, root.visits)
+
+    def test_node_rewards_are_for_piece_that_moved_into_node(self):
+        node = MCTSNode(0, Board.O, [])
+        self.assertEqual(1.0, node.get_reward(Board.O))
+        self.assertEqual(0.0, node.get_reward(Board.X))
+        self.assertEqual(0.5, node.get_reward(Board.DRAW))
+
+    def test_mcts_never_loses_to_random_player(self):
+        controller = GameController(self.player, RandomPlayer())
+        for _ in range(5):
+            controller.reset()
+            winner, _ = controller.play_to_end()
+            self.assertNotEqual(Board.O, winner)
@@ -0,0 +1,72 @@
+import unittest
+from mock import patch
+from minimax_player import MinimaxPlayer
+from board import Board
+from symmetry import Symmetry
+from board_test_utils import set_board, assert_get_move_is, get_board_state_key
+
+class TestMinimaxPlayer(unittest.TestCase):
+    def setUp(self):
+        MinimaxPlayer.transpositions.clear()
+        MinimaxPlayer.best_moves.clear()
+        self.player = MinimaxPlayer()
+        self.board = Board()
+        self.player.set_board(self.board)
+
+    def test_get_move_takes_win(self):
+        assert_get_move_is(self, self.player, self.board, 2, Board.X, "XX-|OO-|---")
+
+    def test_get_move_blocks_loss(self):
+        assert_get_move_is(self, self.player, self.board, 5, Board.X, "X--|OO-|--X")
+
+    def test_get_move_prefers_quickest_win(self):
+        # Blocking at 5 also wins, but only later
+        assert_get_move_is(self, self.player, self.board, 6, Board.X, "X-O|X--|--O")
+
+    def test_get_best_moves_replies_to_opposite_corners_on_an_edge(self):
+        self.player.set_piece(Board.O)
+        set_board(self.board, "X--|-O-|--X")
+        self.assertEqual([1, 3, 5, 7], sorted(self.player.get_best_moves()))
+
+    def test_get_move_scores_on_empty_board_are_draws(self):
+        self.player.set_piece(Board.X)
+        self.assertEqual({position: 0 for position in range(9)}, self.player.get_move_scores())
+
+    def test_get_move_scores_scores_quicker_wins_higher(self):
+        self.player.set_piece(Board.X)
+        set_board(self.board, "X-O|X--|--O")
+        move_scores = self.player.get_move_scores()
+        self.assertEqual(5, move_scores[6])
+        self.assertEqual(3, move_scores[5])
+        self.assertLess(move_scores[1], 0)
+
+    def test_transpositions_are_keyed_on_canonical_states(self):
+        self.player.set_piece(Board.X)
+        self.player.get_move_scores()
+        self.assertTrue(self.player.transpositions)
+        for key in self.player.transpositions:
+            self.assertEqual(Symmetry.get_canonical_key(key), key)
+
+    def test_get_best_moves_is_cached_by_board_state(self):
+        self.player.set_piece(Board.O)
+        set_board(self.board, "X--|---|---")
+        best_moves = self.player.get_best_moves()
+        self.assertEqual(best_moves, MinimaxPlayer.best_moves[get_board_state_key("X--|---|---")])
+        with patch('minimax_player.MinimaxPlayer.get_move_scores') as scores_mock:
+            self.assertEqual(best_moves, self.player.get_best_moves())
+        scores_mock.assert_not_called()
+
+    def test_minimax_never_loses_to_itself(self):
+        x_player = MinimaxPlayer()
+        o_player = MinimaxPlayer()
+        for player, piece in [(x_player, Board.X), (o_player, Board.O)]:
+            player.set_board(self.board)
+            player.set_piece(piece)
+        winner = None
+        for move_number in range(9):
+            player = [x_player, o_player][move_number % 2]
+            self.board.make_move(player.get_move(), player.piece)
+            winner = self.board.get_winner()
+            if winner is not None:
+                break
+        self.assertEqual(Board.DRAW, winner)
@@ -0,0 +1,59 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import model_file
+
+class TestModelFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".model")
+        os.close(fd)
+        self.params = {"alpha": 0.1, "epsilon": 0.05}
+        self.values = np.array([0.5, np.nan, 1.0], dtype=np.float32)
+        self.moves = np.arange(6, dtype=np.int16).reshape((2, 3))
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def write_bytes(self, contents):
+        with open(self.filename, "wb") as f:
+            f.write(contents)
+
+    def test_save_and_load_round_trip(self):
+        model_file.save_model(self.filename, self.params, {"values": self.values, "moves": self.moves})
+        params, arrays = model_file.load_model(self.filename)
+        self.assertEqual(self.params, params)
+        np.testing.assert_array_equal(self.values, arrays["values"])
+        np.testing.assert_array_equal(self.moves, arrays["moves"])
+        self.assertEqual(np.float32, arrays["values"].dtype)
+        self.assertEqual(np.int16, arrays["moves"].dtype)
+
+    def test_load_memory_maps_aligned_arrays(self):
+        model_file.save_model(self.filename, self.params, {"values": self.values, "moves": self.moves})
+        _, arrays = model_file.load_model(self.filename)
+        for array in arrays.values():
+            self.assertIsInstance(array, np.memmap)
+            self.assertEqual(0, array.offset % model_file.ALIGNMENT)
+
+    def test_load_is_copy_on_write_by_default(self):
+        model_file.save_model(self.filename, self.params, {"values": self.values})
+        _, arrays = model_file.load_model(self.filename)
+        arrays["values"][0] = 0.25
+        _, arrays = model_file.load_model(self.filename)
+        self.assertEqual(0.5, arrays["values"][0])
+
+    def test_load_read_only(self):
+        model_file.save_model(self.filename, self.params, {"values": self.values})
+        _, arrays = model_file.load_model(self.filename, mode="r")
+        with self.assertRaises(ValueError):
+            arrays["values"][0] = 0.25
+
+    def test_load_raises_error_if_not_model_file(self):
+        self.write_bytes(b"\x80\x04not a model file")
+        with self.assertRaises(ValueError):
+            model_file.load_model(self.filename)
+
+    def test_load_raises_error_if_unsupported_version(self):
+        self.write_bytes(model_file.PREFIX.pack(model_file.MAGIC, model_file.VERSION + 1, 2) + b"{}")
+        with self.assertRaises(ValueError):
+            model_file.load_model(self.filename)
@@ -0,0 +1,48 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import model_file
+from model_registry import ModelRegistry
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".model")
+        os.close(fd)
+        self.save(0.5)
+        self.registry = ModelRegistry()
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def save(self, value, mtime=None):
+        model_file.save_model(self.filename, {"alpha": value}, {"values": np.array([value], dtype=np.float32)})
+        if mtime is not None:
+            os.utime(self.filename, (mtime, mtime))
+
+    def test_load_returns_params_and_read_only_arrays(self):
+        params, learned = self.registry.load(self.filename)
+        self.assertEqual({"alpha": 0.5}, params)
+        self.assertEqual(0.5, learned["values"][0])
+        with self.assertRaises(ValueError):
+            learned["values"][0] = 0.25
+
+    def test_load_shares_arrays_across_calls(self):
+        _, learned1 = self.registry.load(self.filename)
+        _, learned2 = self.registry.load(self.filename)
+        self.assertIs(learned1["values"], learned2["values"])
+
+    def test_load_reloads_if_file_modified(self):
+        self.save(0.5, mtime=1000)
+        _, learned1 = self.registry.load(self.filename)
+        self.save(0.75, mtime=2000)
+        params, learned2 = self.registry.load(self.filename)
+        self.assertEqual({"alpha": 0.75}, params)
+        self.assertEqual(0.75, learned2["values"][0])
+        self.assertEqual(0.5, learned1["values"][0])
+
+    def test_clear_forgets_loaded_models(self):
+        _, learned1 = self.registry.load(self.filename)
+        self.registry.clear()
+        _, learned2 = self.registry.load(self.filename)
+        self.assertIsNot(learned1["values"], learned2["values"])
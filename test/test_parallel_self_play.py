@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from parallel_self_play import ParallelSelfPlay
+from td_learning_player import TDLearningPlayer
+from value_table import ArrayValueTable, SharedValueTable
+from random_player import RandomPlayer
+from board import Board
+from state_tables import WINNERS
+from board_test_utils import get_board_state_key
+
+class TestParallelSelfPlay(unittest.TestCase):
+    def setUp(self):
+        self.parallel = ParallelSelfPlay(2, seed=1)
+        self.player = TDLearningPlayer()
+        self.player.use_dense_values()
+
+    def tearDown(self):
+        self.parallel.close()
+
+    def test_play_returns_winner_for_each_game(self):
+        winners = self.parallel.play(RandomPlayer(), RandomPlayer(), 101)
+        self.assertEqual(101, len(winners))
+        self.assertTrue(np.isin(winners, [Board.X, Board.O, Board.DRAW]).all())
+
+    def test_play_merges_learned_values(self):
+        self.player.enable_learning()
+        self.parallel.play(self.player, RandomPlayer(), 200)
+        self.assertGreater(self.player.get_num_states(), 100)
+        winning_values = self.player.values.array[WINNERS == Board.X]
+        winning_values = winning_values[~np.isnan(winning_values)]
+        self.assertGreater(len(winning_values), 0)
+        np.testing.assert_array_equal(1.0, winning_values)
+
+    def test_play_does_not_change_values_if_learning_disabled(self):
+        self.player.disable_learning()
+        self.parallel.play(self.player, RandomPlayer(), 20)
+        self.assertEqual(0, self.player.get_num_states())
+
+    def test_play_merges_visits(self):
+        self.player.set_params(count_visits=True)
+        self.player.enable_learning()
+        self.parallel.play(self.player, RandomPlayer(), 200)
+        # Every game updates exactly one state with a single X, and no final states
+        self.assertEqual(200, self.player.visits[list(Board.MOVE_DELTAS[Board.X])].sum())
+        self.assertEqual(0, self.player.visits[WINNERS != Board.EMPTY].sum())
+
+    def test_merge_visits_adds_visits_from_each_worker(self):
+        self.player.set_params(count_visits=True)
+        self.player.visits[:2] = [1, 2]
+        worker_visits = [self.player.visits.copy() for _ in range(2)]
+        worker_visits[0][0] += 3
+        worker_visits[1][0] += 1
+        worker_visits[1][1] += 5
+        self.parallel._merge_visits(self.player, worker_visits)
+        self.assertEqual([5, 7], self.player.visits[:2].tolist())
+
+    def test_merge_values_averages_seen_values(self):
+        state1 = get_board_state_key("X--|---|---")
+        state2 = get_board_state_key("-X-|---|---")
+        worker_values = [np.full(Board.NUM_STATES, np.nan, dtype=np.float32) for _ in range(2)]
+        worker_values[0][state1] = 0.25
+        worker_values[1][state1] = 0.75
+        worker_values[1][state2] = 0.5
+        self.parallel._merge_values(self.player, worker_values)
+        self.assertEqual([(state1, 0.5), (state2, 0.5)], self.player.values.items())
+
+    def test_merge_values_ignores_workers_that_did_not_change_a_value(self):
+        state1 = get_board_state_key("X--|---|---")
+        state2 = get_board_state_key("-X-|---|---")
+        self.player.values[state1] = 0.5
+        self.player.values[state2] = 0.25
+        worker_values = [self.player.values.array.copy() for _ in range(4)]
+        worker_values[0][state1] = 0.875
+        worker_values[1][state1] = 0.625
+        self.parallel._merge_values(self.player, worker_values)
+        self.assertEqual([(state1, 0.75), (state2, 0.25)], self.player.values.items())
+
+    def test_context_manager_unlinks_shared_values_on_error(self):
+        self.player.enable_learning()
+        with self.assertRaises(KeyboardInterrupt):
+            with ParallelSelfPlay(2, seed=2, shared=True) as parallel:
+                parallel.play(self.player, RandomPlayer(), 20)
+                shared_values = self.player.values
+                raise KeyboardInterrupt
+        self.assertNotIsInstance(self.player.values, SharedValueTable)
+        self.assertIsNone(shared_values.array)
+
+    def test_play_with_shared_values_updates_shared_copy(self):
+        parallel = ParallelSelfPlay(2, seed=2, shared=True)
+        self.player.enable_learning()
+        parallel.play(self.player, RandomPlayer(), 200)
+        self.assertIsInstance(self.player.values, SharedValueTable)
+        self.assertGreater(self.player.get_num_states(), 100)
+        num_states = self.player.get_num_states()
+
+        parallel.close()
+        self.assertIsInstance(self.player.values, ArrayValueTable)
+        self.assertNotIsInstance(self.player.values, SharedValueTable)
+        self.assertEqual(num_states, self.player.get_num_states())
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from mock import patch
+from perfect_player import PerfectPlayer
+from minimax_player import MinimaxPlayer
+from solve_game import GameSolver
+from board import Board
+from board_test_utils import set_board, assert_get_move_is, get_board_state_key
+
+class TestPerfectPlayer(unittest.TestCase):
+    def setUp(self):
+        self.player = PerfectPlayer()
+        self.board = Board()
+        self.player.set_board(self.board)
+
+    def test_get_move_takes_win(self):
+        assert_get_move_is(self, self.player, self.board, 2, Board.X, "XX-|OO-|---")
+
+    def test_get_move_blocks_loss(self):
+        assert_get_move_is(self, self.player, self.board, 5, Board.X, "X--|OO-|--X")
+
+    def test_get_best_moves_replies_to_opposite_corners_on_an_edge(self):
+        self.player.set_piece(Board.O)
+        set_board(self.board, "X--|-O-|--X")
+        self.assertEqual([1, 3, 5, 7], self.player.get_best_moves())
+
+    def test_get_score_of_empty_board_is_draw(self):
+        self.assertEqual(0, self.player.get_score())
+
+    def test_get_move_scores_match_minimax(self):
+        minimax_player = MinimaxPlayer()
+        minimax_player.set_board(self.board)
+        for piece, pieces in [(Board.X, "---|---|---"), (Board.O, "X--|---|---"), (Board.X, "X-O|X--|--O")]:
+            self.board.reset()
+            set_board(self.board, pieces)
+            self.player.set_piece(piece)
+            minimax_player.set_piece(piece)
+            self.assertEqual(minimax_player.get_move_scores(), self.player.get_move_scores())
+
+    @patch('perfect_player.random.choice')
+    def test_get_move_chooses_among_best_moves(self, choice_mock):
+        choice_mock.side_effect = lambda moves: moves[-1]
+        assert_get_move_is(self, self.player, self.board, 7, Board.O, "X--|-O-|--X")
+        choice_mock.assert_called_once_with([1, 3, 5, 7])
+
+    def test_get_scores_uses_tables_reloaded_by_registry(self):
+        self.addCleanup(PerfectPlayer.load_tables)
+        tables = {"scores": np.arange(3), "best_moves": np.zeros(3, dtype=np.uint16)}
+        with patch('perfect_player.registry.load') as load_mock:
+            load_mock.return_value = ({}, tables)
+            self.assertEqual([0, 1, 2], PerfectPlayer.get_scores())
+            load_mock.return_value = ({}, dict(tables, scores=np.arange(3, 6)))
+            self.assertEqual([3, 4, 5], PerfectPlayer.get_scores())
+
+class TestGameSolver(unittest.TestCase):
+    def setUp(self):
+        self.solution = GameSolver([]).solve()
+
+    def test_solve_matches_saved_tables(self):
+        np.testing.assert_array_equal(PerfectPlayer.get_best_move_array(), self.solution["best_moves"])
+        self.assertEqual(PerfectPlayer.get_scores(), self.solution["scores"].tolist())
+
+    def test_solve_has_best_moves_for_every_position_to_move_from(self):
+        self.assertEqual(4520, np.count_nonzero(self.solution["best_moves"]))
+
+    def test_solve_scores_by_how_soon_the_game_is_won(self):
+        self.assertEqual(5, self.solution["scores"][get_board_state_key("X-O|X--|--O")])
+        self.assertEqual(-3, self.solution["scores"][get_board_state_key("X-O|-O-|X-X")])
+
+    def test_solve_has_no_moves_for_finished_games(self):
+        self.assertEqual(0, self.solution["best_moves"][get_board_state_key("XXX|OO-|---")])
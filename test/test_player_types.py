@@ -2,7 +2,12 @@ import unittest
 import player_types
 from td_learning_player import TDLearningPlayer
 from td_symmetric_learning_player import TDSymmetricLearningPlayer
+from td_lambda_learning_player import TDLambdaLearningPlayer
+from q_learning_player import QLearningPlayer
 from random_player import RandomPlayer
+from minimax_player import MinimaxPlayer
+from mcts_player import MCTSPlayer
+from perfect_player import PerfectPlayer
 from human_player import HumanPlayer
 
 class TestPlayerTypes(unittest.TestCase):
@@ -19,36 +24,56 @@ class TestPlayerTypes(unittest.TestCase):
     def test_get_player_for_learning_players(self):
         self.assertIsInstance(player_types.get_player("TD"), TDLearningPlayer)
         self.assertIsInstance(player_types.get_player("TDS"), TDSymmetricLearningPlayer)
+        self.assertIsInstance(player_types.get_player("TDL"), TDLambdaLearningPlayer)
+        self.assertIsInstance(player_types.get_player("Q"), QLearningPlayer)
 
     def test_get_player_for_non_learning_players(self):
         self.assertIsInstance(player_types.get_player("Random"), RandomPlayer)
+        self.assertIsInstance(player_types.get_player("Minimax"), MinimaxPlayer)
+        self.assertIsInstance(player_types.get_player("MCTS"), MCTSPlayer)
+        self.assertIsInstance(player_types.get_player("Perfect"), PerfectPlayer)
         self.assertIsInstance(player_types.get_player("Human"), HumanPlayer)
 
     def test_get_player_for_bad_player(self):
         self.assertRaises(KeyError, player_types.get_player, "Bad")
 
     def test_get_learning_player_types(self):
-        self.assertEqual(["TD", "TDS"], player_types.get_learning_player_types())
+        self.assertEqual(["Q", "TD", "TDL", "TDS"], player_types.get_learning_player_types())
 
     def test_get_player_types(self):
-        self.assertEqual(["Human", "Random", "TD", "TDS"], player_types.get_player_types())
+        self.assertEqual(["Human", "MCTS", "Minimax", "Perfect", "Q", "Random", "TD", "TDL", "TDS"], player_types.get_player_types())
+
+    def test_get_opponent_types(self):
+        self.assertEqual(["MCTS", "Minimax", "Perfect", "Random"], player_types.get_opponent_types())
 
     def test_get_learning_player_descriptions(self):
         self.assertEqual(
-            ["Temporal Difference Learning Player", "Temporal Difference Symmetric Learning Player"],
+            [
+                "Q-Learning Player",
+                "Temporal Difference Learning Player",
+                "Temporal Difference Lambda Learning Player",
+                "Temporal Difference Symmetric Learning Player"
+            ],
             player_types.get_learning_player_descriptions())
 
     def test_get_player_descriptions(self):
         self.assertEqual(
             [
                 "Human Player",
+                "Monte Carlo Tree Search Player",
+                "Minimax Player",
+                "Perfect Player",
+                "Q-Learning Player",
                 "Random Player",
                 "Temporal Difference Learning Player",
+                "Temporal Difference Lambda Learning Player",
                 "Temporal Difference Symmetric Learning Player"
             ], player_types.get_player_descriptions())
 
     def test_get_learning_player_command_line_args(self):
         self.assertEqual(
+            "- Q: Q-Learning Player\n"
             "- TD: Temporal Difference Learning Player\n"
+            "- TDL: Temporal Difference Lambda Learning Player\n"
             "- TDS: Temporal Difference Symmetric Learning Player",
             player_types.get_learning_player_command_line_args())
@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+from mock import patch
+from q_learning_player import QLearningPlayer
+from board import Board
+from value_table import ArrayValueTable
+from board_test_utils import get_board_state_key, set_board
+
+class TestQLearningPlayer(unittest.TestCase):
+    PIECES_LIST = ["X--|---|---", "XO-|---|---", "XO-|X--|---", "XO-|XO-|---", "XO-|XO-|X--"]
+
+    def setUp(self):
+        self.player = QLearningPlayer()
+        self.board = Board()
+        self.player.set_board(self.board)
+        self.player.set_piece(Board.X)
+        self.player.set_params(alpha=0.4)
+        self.player.enable_learning()
+
+    def play_game(self, winner):
+        for pieces in self.PIECES_LIST:
+            set_board(self.board, pieces)
+            self.player.store_state()
+        self.player.set_reward(winner)
+
+    def get_value(self, pieces, position):
+        return self.player.values.array[get_board_state_key(pieces), position]
+
+    def test_constructor_uses_dense_values_for_each_move(self):
+        self.assertEqual((Board.NUM_STATES, 9), self.player.values.array.shape)
+        self.assertEqual(0, self.player.get_num_states())
+
+    def test_set_reward_updates_own_moves_towards_best_next_value(self):
+        self.play_game(Board.X)
+        self.assertAlmostEqual(1.0, self.get_value("XO-|XO-|---", 6))
+        self.assertAlmostEqual(0.7, self.get_value("XO-|---|---", 3))
+        self.assertAlmostEqual(0.58, self.get_value("---|---|---", 0))
+        self.assertEqual(3, self.player.get_num_states())
+
+    def test_set_reward_updates_only_own_moves_for_o(self):
+        self.player.set_piece(Board.O)
+        self.play_game(Board.X)
+        self.assertAlmostEqual(0.3, self.get_value("XO-|X--|---", 4))
+        self.assertAlmostEqual(0.5, self.get_value("X--|---|---", 1))
+        self.assertEqual(2, self.player.get_num_states())
+
+    def test_set_reward_does_nothing_if_not_learning(self):
+        self.player.disable_learning()
+        self.play_game(Board.X)
+        self.assertEqual(0, self.player.get_num_states())
+
+    def test_set_reward_counts_visits_of_moves(self):
+        self.player.set_params(alpha=0.4, count_visits=True)
+        self.play_game(Board.X)
+        self.assertEqual(1, self.player.visits[get_board_state_key("XO-|---|---"), 3])
+        self.assertEqual(0, self.player.visits[get_board_state_key("XO-|---|---"), 4])
+        self.assertEqual(0, self.player.visits[get_board_state_key("X--|---|---")].sum())
+
+    def test_set_reward_uses_visit_alpha_of_each_move(self):
+        # A move's first update sets its value to its target, whatever other moves were made
+        self.player.set_params(alpha=0.01, visit_alpha=True)
+        for pieces, winner in [("X--|---|---", Board.X), ("-X-|---|---", Board.O)]:
+            self.player.reset()
+            set_board(self.board, pieces)
+            self.player.store_state()
+            self.player.set_reward(winner)
+        self.assertAlmostEqual(1.0, self.get_value("---|---|---", 0))
+        self.assertAlmostEqual(0.0, self.get_value("---|---|---", 1))
+
+    def test_get_visit_stats_reports_states_moved_from(self):
+        self.player.set_params(alpha=0.4, count_visits=True)
+        self.play_game(Board.X)
+        self.player.reset()
+        self.play_game(Board.X)
+        self.assertEqual({"num_visited": 3, "min": 2, "median": 2.0, "max": 2}, self.player.get_visit_stats())
+
+    def test_get_move_values_uses_initial_values_for_moves_without_values(self):
+        set_board(self.board, "XX-|OO-|---")
+        self.player.values.array[self.board.key, 6] = 0.75
+        self.assertEqual({2: 1.0, 5: 0.5, 6: 0.75, 7: 0.5, 8: 0.5}, self.player.get_move_values())
+        self.assertEqual(2, self.player.get_move())
+
+    def test_get_state_move_values_matches_get_move_values(self):
+        self.play_game(Board.X)
+        self.board.reset()
+        for pieces in ["---|---|---", "XO-|---|---", "XO-|XO-|---"]:
+            set_board(self.board, pieces)
+            move_values = self.player.get_state_move_values(np.array([self.board.key]))[0]
+            for position, value in self.player.get_move_values().items():
+                self.assertAlmostEqual(value, move_values[position])
+            self.assertEqual(9 - len(self.player.get_move_values()), np.isinf(move_values).sum())
+
+    def test_use_dense_values_keeps_values(self):
+        self.play_game(Board.X)
+        values = self.player.values
+        self.player.use_dense_values()
+        self.assertIs(values, self.player.values)
+
+    @patch('model_file.save_model')
+    def test_save_stores_value_for_each_state_and_move(self, save_mock):
+        self.play_game(Board.X)
+        self.player.save()
+        values = save_mock.call_args[0][2]["values"]
+        self.assertEqual((Board.NUM_STATES, 9), values.shape)
+        self.assertAlmostEqual(0.7, values[get_board_state_key("XO-|---|---"), 3])
+
+    @patch('learning_computer_player.model_file.load_model')
+    def test_load_uses_saved_values(self, load_mock):
+        array = np.full((Board.NUM_STATES, 9), np.nan, dtype=np.float32)
+        array[0, 4] = 0.9
+        load_mock.return_value = ({"alpha": 0.2}, {"values": array})
+        self.player.load(Board.O)
+        self.assertIsInstance(self.player.values, ArrayValueTable)
+        self.assertAlmostEqual(0.9, self.player.get_move_values()[4])
+        self.assertEqual(0.2, self.player.alpha)
@@ -0,0 +1,33 @@
+import unittest
+from schedule import Schedule
+
+class TestSchedule(unittest.TestCase):
+    def assert_values_are(self, values, schedule):
+        for step, value in enumerate(values):
+            self.assertAlmostEqual(value, schedule.get_value(step))
+
+    def test_constant_schedule_keeps_initial_value(self):
+        self.assert_values_are([0.1, 0.1, 0.1], Schedule(0.1))
+
+    def test_linear_schedule_moves_evenly_to_final_value(self):
+        self.assert_values_are([0.4, 0.3, 0.2, 0.1, 0.1], Schedule(0.4, "linear", 0.1, 3))
+
+    def test_exponential_schedule_multiplies_by_same_factor_each_step(self):
+        self.assert_values_are([0.8, 0.4, 0.2, 0.1, 0.1], Schedule(0.8, "exponential", 0.1, 3))
+
+    def test_harmonic_schedule_decays_as_one_over_steps(self):
+        self.assert_values_are([0.6, 0.3, 0.2, 0.2], Schedule(0.6, "harmonic", 0.2, 2))
+
+    def test_get_params(self):
+        self.assertEqual(
+            {"type": "linear", "final": 0.1, "num_steps": 3}, Schedule(0.4, "linear", 0.1, 3).get_params())
+
+    def test_schedule_rejects_unknown_type(self):
+        self.assertRaises(ValueError, Schedule, 0.1, "cosine", 0.01, 10)
+
+    def test_schedule_needs_final_value(self):
+        self.assertRaises(ValueError, Schedule, 0.1, "linear")
+
+    def test_exponential_and_harmonic_schedules_need_positive_values(self):
+        self.assertRaises(ValueError, Schedule, 0.1, "exponential", 0.0, 10)
+        self.assertRaises(ValueError, Schedule, 0.1, "harmonic", 0.0, 10)
@@ -38,3 +38,21 @@ class test_symmetry(unittest.TestCase):
 
     def test_get_symmetry_reflect_right_diagonal(self):
         self.assert_symmetry_is(7, "XO-|-XO|OX-", "-O-|XXO|O-X")
+
+    def test_get_symmetric_keys_matches_get_symmetries(self):
+        board = Board()
+        set_board(board, "XO-|-XO|OX-")
+        self.assertEqual(
+            [Board.encode_state(state) for state in self.symmetry.get_symmetries(board.state)],
+            Symmetry.get_symmetric_keys(board.key))
+
+    def test_get_canonical_key_is_same_for_all_symmetries(self):
+        board = Board()
+        set_board(board, "XO-|-XO|OX-")
+        canonical_key = Symmetry.get_canonical_key(board.key)
+        for key in Symmetry.get_symmetric_keys(board.key):
+            self.assertEqual(canonical_key, Symmetry.get_canonical_key(key))
+        self.assertEqual(min(Symmetry.get_symmetric_keys(board.key)), canonical_key)
+
+    def test_get_canonical_key_of_empty_board(self):
+        self.assertEqual(0, Symmetry.get_canonical_key(0))
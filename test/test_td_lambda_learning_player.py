@@ -0,0 +1,60 @@
+import unittest
+from mock import patch
+from td_lambda_learning_player import TDLambdaLearningPlayer
+from td_learning_player import TDLearningPlayer
+from board import Board
+from board_test_utils import get_board_state_key, set_board
+
+class TestTDLambdaLearningPlayer(unittest.TestCase):
+    PIECES_LIST = ["X--|---|---", "XO-|---|---", "XO-|X--|---", "XO-|XO-|---", "XO-|XO-|X--"]
+
+    def setUp(self):
+        self.player = TDLambdaLearningPlayer()
+        self.board = Board()
+        self.player.set_board(self.board)
+        self.player.set_piece(Board.X)
+        self.player.enable_learning()
+
+    def assert_values_after_reward_are(self, values, winner):
+        for pieces in self.PIECES_LIST:
+            set_board(self.board, pieces)
+            self.player.store_state()
+        self.player.set_reward(winner)
+        for pieces, value in zip(self.PIECES_LIST, values):
+            self.assertAlmostEqual(value, self.player.values[get_board_state_key(pieces)])
+
+    def test_set_params_sets_default_lambda_if_not_specified(self):
+        self.player.set_params()
+        self.assertEqual(TDLambdaLearningPlayer.DEFAULT_LAMBDA, self.player.lambda_)
+
+    def test_set_params_sets_lambda_if_specified(self):
+        self.player.set_params(**{"lambda": 0.8})
+        self.assertEqual(0.8, self.player.lambda_)
+
+    def test_get_params_includes_lambda(self):
+        self.player.set_params(**{"alpha": 0.2, "lambda": 0.8})
+        params = self.player.get_params()
+        self.assertEqual(0.2, params["alpha"])
+        self.assertEqual(0.8, params["lambda"])
+
+    def test_set_reward_with_lambda_0_updates_values_like_td_learning_player(self):
+        self.player.set_params(**{"alpha": 0.4, "lambda": 0.0})
+        self.assert_values_after_reward_are([0.5128, 0.532, 0.58, 0.7, 1.0], Board.X)
+
+    def test_set_reward_with_lambda_1_moves_every_value_towards_reward(self):
+        self.player.set_params(**{"alpha": 0.4, "lambda": 1.0})
+        self.assert_values_after_reward_are([0.7, 0.7, 0.7, 0.7, 1.0], Board.X)
+
+    def test_set_reward_mixes_next_value_and_next_target(self):
+        self.player.set_params(**{"alpha": 0.4, "lambda": 0.5})
+        self.assert_values_after_reward_are([0.5686, 0.598, 0.64, 0.7, 1.0], Board.X)
+
+    @patch('model_file.save_model')
+    def test_save_stores_lambda(self, save_mock):
+        self.player.set_params(**{"lambda": 0.8})
+        self.player.save()
+        params = save_mock.call_args[0][1]
+        self.assertEqual(0.8, params["lambda"])
+
+    def test_is_td_learning_player(self):
+        self.assertIsInstance(self.player, TDLearningPlayer)
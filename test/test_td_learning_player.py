@@ -2,6 +2,7 @@ import unittest
 import random
 import pickle
 import os
+import numpy as np
 from mock import patch, Mock
 from io import BytesIO
 from td_learning_player import TDLearningPlayer
@@ -9,7 +10,8 @@ from learning_computer_player import run_if_learner
 from computer_player import run_if_computer
 from human_player import run_if_human
 from board import Board
-from board_test_utils import get_board_state_tuple, set_board, assert_get_move_is, \
+from value_table import ArrayValueTable
+from board_test_utils import get_board_state_key, get_board_state_tuple, set_board, assert_get_move_is, \
     assert_get_move_values_are
 from mock_random import MockRandom
 
@@ -22,10 +24,13 @@ class TestTDLearningPlayer(unittest.TestCase):
         self.player.enable_learning()
         self.func = Mock()
 
+    def get_stored_state(self, pieces):
+        return get_board_state_key(pieces)
+
     def assert_stored_states_are(self, pieces_list, position, piece):
         self.board.make_move(position, piece)
         self.player.store_state()
-        states = list(map(get_board_state_tuple, pieces_list))
+        states = list(map(get_board_state_key, pieces_list))
         self.assertEqual(self.player.states, states)
         
     def assert_get_reward_is(self, reward, winner, piece):
@@ -34,11 +39,11 @@ class TestTDLearningPlayer(unittest.TestCase):
         
     def assert_get_value_and_state_is(self, value, pieces, winner, piece):
         self.player.set_piece(piece)
-        state = get_board_state_tuple(pieces)
+        state = get_board_state_key(pieces)
         current_value, new_state = self.player._get_value_and_state(state, winner)
         self.assertAlmostEqual(value, current_value)
-        self.assertEqual(state, new_state)
-        self.assertIn(state, self.player.values)
+        self.assertEqual(self.get_stored_state(pieces), new_state)
+        self.assertIn(new_state, self.player.values)
         
     def assert_values_after_reward_are(self, values, pieces_list, winner):
         self.player.set_piece(Board.X)
@@ -46,40 +51,61 @@ class TestTDLearningPlayer(unittest.TestCase):
         for pieces, value in zip(pieces_list, values):
             set_board(self.board, pieces)
             self.player.store_state()
-            values_dict[get_board_state_tuple(pieces)] = value
+            values_dict[self.get_stored_state(pieces)] = value
         self.player.set_reward(winner)
         self.assertEqual(sorted(values_dict.keys()), sorted(self.player.values.keys()))
         for key, value in self.player.values.items():
             self.assertAlmostEqual(self.player.values[key], value)
 
-    @patch('builtins.open', create=True)
-    def assert_load_values_are(self, values, piece, filename, open_mock):
+    @patch('model_file.load_model')
+    def assert_load_values_are(self, values, piece, filename, load_mock):
         self.player.piece = None
         params = {"alpha": 0.2, "epsilon": 0.3, "x_draw_reward": 0.45, "o_draw_reward": 0.55}
-        open_mock.return_value = BytesIO(pickle.dumps({"learned": values, "params": params}))
+        load_mock.return_value = (params, {"values": ArrayValueTable(values).array})
         self.player.load(piece)
         self.assertEqual(piece, self.player.piece)
-        self.assertEqual(values, self.player.values)
-        self.assertAlmostEqual(0.2, self.player.alpha)
-        self.assertAlmostEqual(0.3, self.player.epsilon)
-        self.assertAlmostEqual(0.45, self.player.draw_rewards[Board.X])
-        self.assertAlmostEqual(0.55, self.player.draw_rewards[Board.O])
-        self.assert_file_opened_with(filename, "rb", open_mock)
-
-    def assert_file_opened_with(self, filename, mode, open_mock):
-        open_mock.assert_called_once_with(os.path.abspath(os.path.join(".", "data", filename)), mode)
-    
-    @patch('pickle.dump')
+        self.assertEqual(sorted(values.items()), self.player.values.items())
+        self.assert_params_are(0.2, 0.3, 0.45, 0.55)
+        load_mock.assert_called_once_with(self.get_path(filename))
+
     @patch('builtins.open', create=True)
-    def assert_save_values_are(self, values, piece, filename, open_mock, dump_mock):
-        open_mock.return_value = BytesIO()
+    def assert_load_legacy_values_are(self, values, legacy_values, piece, filename, open_mock):
+        self.player.piece = None
+        params = {"alpha": 0.2, "epsilon": 0.3, "x_draw_reward": 0.45, "o_draw_reward": 0.55}
+        open_mock.return_value = BytesIO(pickle.dumps({"learned": legacy_values, "params": params}))
+        self.player.load_legacy(piece)
+        self.assertEqual(piece, self.player.piece)
+        self.assertEqual(values, self.player.values)
+        self.assert_params_are(0.2, 0.3, 0.45, 0.55)
+        open_mock.assert_called_once_with(self.get_path(filename), "rb")
+
+    def assert_params_are(self, alpha, epsilon, x_draw_reward, o_draw_reward):
+        self.assertAlmostEqual(alpha, self.player.alpha)
+        self.assertAlmostEqual(epsilon, self.player.epsilon)
+        self.assertAlmostEqual(x_draw_reward, self.player.draw_rewards[Board.X])
+        self.assertAlmostEqual(o_draw_reward, self.player.draw_rewards[Board.O])
+
+    def get_path(self, filename):
+        return os.path.abspath(os.path.join(".", "data", filename))
+
+    @patch('model_file.save_model')
+    def assert_save_values_are(self, values, piece, filename, save_mock):
         self.player.set_piece(piece)
-        params = {"alpha": 0.05, "epsilon": 0.2, "x_draw_reward": 0.55, "o_draw_reward": 0.45}
+        params = \
+        {
+            "alpha": 0.05, "epsilon": 0.2, "x_draw_reward": 0.55, "o_draw_reward": 0.45,
+            "alpha_schedule": {"type": "linear", "final": 0.01, "num_steps": 10},
+            "epsilon_schedule": {"type": "constant", "final": None, "num_steps": 1},
+            "schedule_step": 5, "count_visits": False, "visit_alpha": False
+        }
         self.player.set_params(**params)
         self.player.values = values
         self.player.save()
-        self.assert_file_opened_with(filename, "wb", open_mock)
-        dump_mock.assert_called_once_with({"learned": values, "params": params}, open_mock.return_value)
+        save_mock.assert_called_once()
+        (path, saved_params, learned), _ = save_mock.call_args
+        self.assertEqual(self.get_path(filename), path)
+        self.assertEqual(params, saved_params)
+        np.testing.assert_array_equal(ArrayValueTable(values).array, learned["values"])
 
     def test_constructor_initializes_board_and_piece_to_none(self):
         player = TDLearningPlayer()
@@ -168,11 +194,33 @@ class TestTDLearningPlayer(unittest.TestCase):
             "alpha": self.player.DEFAULT_ALPHA+0.01,
             "epsilon": TDLearningPlayer.DEFAULT_EPSILON-0.01,
             "x_draw_reward": TDLearningPlayer.DEFAULT_X_DRAW_REWARD+0.1,
-            "o_draw_reward": TDLearningPlayer.DEFAULT_O_DRAW_REWARD-0.1
+            "o_draw_reward": TDLearningPlayer.DEFAULT_O_DRAW_REWARD-0.1,
+            "alpha_schedule": {"type": "constant", "final": None, "num_steps": 1},
+            "epsilon_schedule": {"type": "exponential", "final": 0.01, "num_steps": 100},
+            "schedule_step": 0,
+            "count_visits": True,
+            "visit_alpha": False
         }
         self.player.set_params(**params)
         self.assertEqual(params, self.player.get_params())
 
+    def test_set_params_applies_schedules_at_schedule_step(self):
+        self.player.set_params(
+            alpha=0.2, alpha_schedule={"type": "linear", "final": 0.1, "num_steps": 10},
+            epsilon=0.4, epsilon_schedule={"type": "harmonic", "final": 0.1, "num_steps": 10},
+            schedule_step=5)
+        self.assertAlmostEqual(0.15, self.player.alpha)
+        self.assertAlmostEqual(0.16, self.player.epsilon)
+
+    def test_set_schedule_step_updates_alpha_and_epsilon(self):
+        self.player.set_params(
+            alpha=0.2, alpha_schedule={"type": "exponential", "final": 0.05, "num_steps": 2},
+            epsilon=0.4, epsilon_schedule={"type": "linear", "final": 0.0, "num_steps": 4})
+        self.player.set_schedule_step(1)
+        self.assertAlmostEqual(0.1, self.player.alpha)
+        self.assertAlmostEqual(0.3, self.player.epsilon)
+        self.assertEqual(1, self.player.get_params()["schedule_step"])
+
     def test_store_state_appends_state(self):
         self.assert_stored_states_are(["X--|---|---"], 0, Board.X)
         self.assert_stored_states_are(["X--|---|---", "XO-|---|---"], 1, Board.O)
@@ -221,13 +269,26 @@ class TestTDLearningPlayer(unittest.TestCase):
         self.assert_get_value_and_state_is(0.7, "OOX|XXO|OXO", Board.DRAW, Board.O)
 
     def test_get_value_and_state_returns_current_value_if_state_known(self):
-        state1 = get_board_state_tuple("X--|---|---")
-        state2 = get_board_state_tuple("XO-|---|---")
+        state1 = self.get_stored_state("X--|---|---")
+        state2 = self.get_stored_state("XO-|---|---")
         self.player.values[state1] = 0.6
         self.player.values[state2] = 0.3
         self.assert_get_value_and_state_is(0.6, "X--|---|---", None, Board.X)
         self.assert_get_value_and_state_is(0.3, "XO-|---|---", None, Board.O)
 
+    def test_get_value_and_state_does_not_store_value_if_learning_disabled(self):
+        self.player.disable_learning()
+        self.player.set_piece(Board.X)
+        value, state = self.player._get_value_and_state(get_board_state_key("X--|---|---"))
+        self.assertAlmostEqual(0.5, value)
+        self.assertNotIn(state, self.player.values)
+
+    @patch('model_registry.registry.load')
+    def test_load_shared_uses_model_registry(self, load_mock):
+        load_mock.return_value = ({}, {"values": ArrayValueTable().array})
+        self.player.load(Board.X, shared=True)
+        load_mock.assert_called_once_with(self.get_path(self.file_name_prefix + "X.model"))
+
     def test_set_reward_updates_values_for_each_state(self):
         self.player.set_params(alpha=0.4)
         self.assert_values_after_reward_are(
@@ -241,11 +302,11 @@ class TestTDLearningPlayer(unittest.TestCase):
 
     def test_set_reward_does_not_update_values_for_each_state_if_learning_disabled(self):
         self.player.disable_learning()
-        self.player.values[get_board_state_tuple("---|-X-|---")] = 0.6
-        self.player.values[get_board_state_tuple("-O-|-X-|---")] = 0.55
-        self.player.values[get_board_state_tuple("-O-|-X-|--X")] = 0.7
-        self.player.values[get_board_state_tuple("-OO|-X-|--X")] = 0.85
-        self.player.values[get_board_state_tuple("XOO|-X-|--X")] = 1.0
+        self.player.values[self.get_stored_state("---|-X-|---")] = 0.6
+        self.player.values[self.get_stored_state("-O-|-X-|---")] = 0.55
+        self.player.values[self.get_stored_state("-O-|-X-|--X")] = 0.7
+        self.player.values[self.get_stored_state("-OO|-X-|--X")] = 0.85
+        self.player.values[self.get_stored_state("XOO|-X-|--X")] = 1.0
         self.assert_values_after_reward_are(
             [0.6, 0.55, 0.7, 0.85, 1.0],
             ["---|-X-|---",
@@ -270,7 +331,7 @@ class TestTDLearningPlayer(unittest.TestCase):
             self, random_mock, choice_mock):
         random_mock.return_value = 0.1
         choice_mock.side_effect = MockRandom(0).choice
-        self.player.values[get_board_state_tuple("---|-XO|---")] = 0.501
+        self.player.values[self.get_stored_state("---|-XO|---")] = 0.501
         assert_get_move_is(self, self.player, self.board, 5, Board.O, "---|-X-|---")
         choice_mock.assert_called_once_with([5])
 
@@ -280,9 +341,9 @@ class TestTDLearningPlayer(unittest.TestCase):
             self, random_mock, choice_mock):
         random_mock.return_value = 0.1
         choice_mock.side_effect = MockRandom(1).choice
-        self.player.values[get_board_state_tuple("X--|-XO|---")] = 0.501
-        self.player.values[get_board_state_tuple("--X|-XO|---")] = 0.501
-        self.player.values[get_board_state_tuple("---|-XO|X--")] = 0.501
+        self.player.values[self.get_stored_state("X--|-XO|---")] = 0.501
+        self.player.values[self.get_stored_state("--X|-XO|---")] = 0.501
+        self.player.values[self.get_stored_state("---|-XO|X--")] = 0.501
         assert_get_move_is(self, self.player, self.board, 2, Board.X, "---|-XO|---")
         choice_mock.assert_called_once_with([0, 2, 6])
 
@@ -292,7 +353,7 @@ class TestTDLearningPlayer(unittest.TestCase):
         self.player.disable_learning()
         random_mock.return_value = 0.099
         choice_mock.side_effect = MockRandom(0).choice
-        self.player.values[get_board_state_tuple("---|-O-|--X")] = 0.501
+        self.player.values[self.get_stored_state("---|-O-|--X")] = 0.501
         assert_get_move_is(self, self.player, self.board, 4, Board.O, "---|---|--X")
         random_mock.assert_not_called()
         choice_mock.assert_called_once_with([4])
@@ -301,37 +362,116 @@ class TestTDLearningPlayer(unittest.TestCase):
         self.assertEqual(0, self.player.get_num_states())
 
     def test_get_num_states_returns_correct_num_of_states(self):
-        self.player.values[get_board_state_tuple("---|-X-|---")] = 0.9
-        self.player.values[get_board_state_tuple("---|-X-|--O")] = 0.75
-        self.player.values[get_board_state_tuple("---|XX-|--O")] = 0.7
+        self.player.values[self.get_stored_state("---|-X-|---")] = 0.9
+        self.player.values[self.get_stored_state("---|-X-|--O")] = 0.75
+        self.player.values[self.get_stored_state("---|XX-|--O")] = 0.7
         self.assertEqual(3, self.player.get_num_states())
 
+    def test_use_dense_values_keeps_values(self):
+        state = get_board_state_key("---|-X-|---")
+        self.player.values[state] = 0.75
+        self.player.use_dense_values()
+        self.assertIsInstance(self.player.values, ArrayValueTable)
+        self.assertEqual([(state, 0.75)], self.player.values.items())
+
+    def test_set_reward_counts_visits_if_counting_visits(self):
+        self.player.set_params(count_visits=True)
+        pieces_list = ["X--|---|---", "XO-|---|---", "XO-|X--|---"]
+        self.assert_values_after_reward_are([0.5, 0.55, 1.0], pieces_list, Board.X)
+        self.player.reset()
+        for pieces in pieces_list[1:]:
+            set_board(self.board, pieces)
+            self.player.store_state()
+        self.player.set_reward(Board.X)
+        # The final states are set to the reward rather than updated, so they aren't visited
+        self.assertEqual({"num_visited": 2, "min": 1, "median": 1.5, "max": 2}, self.player.get_visit_stats())
+
+    def test_set_reward_uses_visit_alpha_if_enabled(self):
+        self.player.set_params(alpha=0.1, visit_alpha=True)
+        state = self.get_stored_state("XO-|---|---")
+        self.player.visits[state] = 3
+        self.assert_values_after_reward_are(
+            [0.625, 0.625, 1.0], ["X--|---|---", "XO-|---|---", "XO-|X--|---"], Board.X)
+
+    def test_get_alpha_stops_at_alpha(self):
+        self.player.set_params(alpha=0.2, visit_alpha=True)
+        states = np.array([self.get_stored_state(pieces) for pieces in ["X--|---|---", "-X-|---|---"]])
+        self.player.add_visits(states, np.array([2, 10]))
+        np.testing.assert_allclose([0.5, 0.2], self.player.get_alpha(states))
+
+    def test_get_visit_stats_is_none_if_not_counting_visits(self):
+        self.assertIsNone(self.player.visits)
+        self.assertIsNone(self.player.get_visit_stats())
+
+    def test_set_reward_updates_dense_values_for_each_state(self):
+        self.player.use_dense_values()
+        self.test_set_reward_updates_values_for_each_state()
+
+    def test_get_values_uses_initial_values_for_states_without_values(self):
+        self.player.set_piece(Board.X)
+        self.player.use_dense_values()
+        self.player.values[self.get_stored_state("X--|---|---")] = 0.7
+        states = np.array([get_board_state_key(pieces) for pieces in
+                           ["X--|---|---", "-X-|---|---", "XXX|OO-|---", "OOO|XX-|X--", "XOX|XOO|OXX"]])
+        np.testing.assert_allclose([0.7, 0.5, 1.0, 0.0, 0.5], self.player.get_values(states))
+        self.assertEqual(1, self.player.get_num_states())
+
     def test_get_move_values_returns_move_values_for_available_moves(self):
-        self.player.values[get_board_state_tuple("XOO|---|-X-")] = 0.7
-        self.player.values[get_board_state_tuple("XO-|O--|-X-")] = 0.65
-        self.player.values[get_board_state_tuple("XO-|-O-|-X-")] = 0.75
-        self.player.values[get_board_state_tuple("XO-|--O|-X-")] = 0.62
-        self.player.values[get_board_state_tuple("XO-|---|OX-")] = 0.72
-        self.player.values[get_board_state_tuple("XO-|---|-XO")] = 0.67
+        self.player.values[self.get_stored_state("XOO|---|-X-")] = 0.7
+        self.player.values[self.get_stored_state("XO-|O--|-X-")] = 0.65
+        self.player.values[self.get_stored_state("XO-|-O-|-X-")] = 0.75
+        self.player.values[self.get_stored_state("XO-|--O|-X-")] = 0.62
+        self.player.values[self.get_stored_state("XO-|---|OX-")] = 0.72
+        self.player.values[self.get_stored_state("XO-|---|-XO")] = 0.67
         assert_get_move_values_are(
             self, self.player, self.board, {2: 0.7, 3: 0.65, 4: 0.75, 5: 0.62, 6: 0.72, 8: 0.67},
             Board.O, "XO-|---|-X-")
         
     def test_load_stores_values_for_x(self):
-        values = {"foo": "bar"}
-        self.assert_load_values_are(values, Board.X, self.file_name_prefix + "X.pkl")
+        values = {self.get_stored_state("X--|---|---"): 0.75}
+        self.assert_load_values_are(values, Board.X, self.file_name_prefix + "X.model")
 
     def test_load_stores_values_for_o(self):
-        values = {"bar": "foo"}
-        self.assert_load_values_are(values, Board.O, self.file_name_prefix + "O.pkl")
+        values = {self.get_stored_state("X--|-O-|---"): 0.25}
+        self.assert_load_values_are(values, Board.O, self.file_name_prefix + "O.model")
+
+    @patch('model_file.load_model')
+    def test_load_restores_visits_if_counting_visits(self, load_mock):
+        visits = np.arange(Board.NUM_STATES)
+        load_mock.return_value = (
+            {"count_visits": True}, {"values": ArrayValueTable().array, "visits": visits})
+        self.player.load(Board.X)
+        self.assertIs(visits, self.player.visits)
+
+    @patch('model_file.save_model')
+    def test_save_stores_visits_if_counting_visits(self, save_mock):
+        self.player.set_piece(Board.X)
+        self.player.set_params(count_visits=True)
+        self.player.add_visits(self.get_stored_state("---|-X-|---"))
+        self.player.save()
+        (_, params, learned), _ = save_mock.call_args
+        self.assertTrue(params["count_visits"])
+        self.assertEqual(1, learned["visits"][self.get_stored_state("---|-X-|---")])
+
+    def test_load_legacy_converts_state_tuples_for_x(self):
+        state = get_board_state_tuple("--X|---|---")
+        self.assert_load_legacy_values_are(
+            {self.get_stored_state("--X|---|---"): 0.75}, {state: 0.75}, Board.X,
+            self.file_name_prefix + "X.pkl")
+
+    def test_load_legacy_converts_state_tuples_for_o(self):
+        state = get_board_state_tuple("--X|---|-O-")
+        self.assert_load_legacy_values_are(
+            {self.get_stored_state("--X|---|-O-"): 0.25}, {state: 0.25}, Board.O,
+            self.file_name_prefix + "O.pkl")
 
     def test_save_stores_values_for_x(self):
-        values = {"baz": "quux"}
-        self.assert_save_values_are(values, Board.X, self.file_name_prefix + "X.pkl")
+        values = {self.get_stored_state("---|-X-|---"): 0.5}
+        self.assert_save_values_are(values, Board.X, self.file_name_prefix + "X.model")
 
     def test_save_stores_values_for_o(self):
-        values = {"quux": "baz"}
-        self.assert_save_values_are(values, Board.O, self.file_name_prefix + "O.pkl")
+        values = {self.get_stored_state("---|-X-|O--"): 0.125}
+        self.assert_save_values_are(values, Board.O, self.file_name_prefix + "O.model")
 
     def test_indicate_move(self):
         self.assertEqual("My move is 8", self.player.indicate_move(7))
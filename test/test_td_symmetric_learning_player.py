@@ -2,7 +2,8 @@ from mock import patch
 from test_td_learning_player import TestTDLearningPlayer
 from td_symmetric_learning_player import TDSymmetricLearningPlayer
 from board import Board
-from board_test_utils import get_board_state_tuple, assert_get_move_is, set_board
+from symmetry import Symmetry
+from board_test_utils import get_board_state_key, assert_get_move_is, set_board
 from mock_random import MockRandom
 
 class TestTDSymmetricLearningPlayer(TestTDLearningPlayer):
@@ -13,10 +14,13 @@ class TestTDSymmetricLearningPlayer(TestTDLearningPlayer):
         self.player.set_board(self.board)
         self.player.enable_learning()
 
+    def get_stored_state(self, pieces):
+        return Symmetry.get_canonical_key(get_board_state_key(pieces))
+
     def assert_get_value_and_state_symmetric_is(self, value, pieces, symmetric_pieces, winner, piece):
         self.player.set_piece(piece)
-        state = get_board_state_tuple(pieces)
-        symmetric_state = get_board_state_tuple(symmetric_pieces)
+        state = self.get_stored_state(pieces)
+        symmetric_state = get_board_state_key(symmetric_pieces)
         current_value, new_state = self.player._get_value_and_state(symmetric_state, winner)
         self.assertAlmostEqual(value, current_value)
         self.assertEqual(state, new_state)
@@ -30,15 +34,15 @@ class TestTDSymmetricLearningPlayer(TestTDLearningPlayer):
         for pieces, symmetric_pieces, value in zip(pieces_list, symmetric_pieces_list, values):
             set_board(self.board, symmetric_pieces)
             self.player.store_state()
-            values_dict[get_board_state_tuple(pieces)] = value
+            values_dict[self.get_stored_state(pieces)] = value
         self.player.set_reward(winner)
         self.assertEqual(sorted(values_dict.keys()), sorted(self.player.values.keys()))
         for key, value in self.player.values.items():
             self.assertAlmostEqual(self.player.values[key], value)
 
     def test_get_value_and_state_returns_current_value_if_symmetric_state_known(self):
-        state1 = get_board_state_tuple("XO-|X--|---")
-        state2 = get_board_state_tuple("XO-|X--|O--")
+        state1 = self.get_stored_state("XO-|X--|---")
+        state2 = self.get_stored_state("XO-|X--|O--")
         self.player.values[state1] = 0.56
         self.player.values[state2] = 0.45
 
@@ -79,20 +83,17 @@ class TestTDSymmetricLearningPlayer(TestTDLearningPlayer):
     def test_get_move_chooses_best_available_move_if_random_gte_epsilon(
             self, random_mock, choice_mock):
         random_mock.return_value = 0.1
-        choice_mock.side_effect = MockRandom(0).choice
-        self.player.values[get_board_state_tuple("---|-XO|---")] = 0.501 # Original
-                                                                         # Reflected horizontally
-        
-        # Force other symmetric choices to be of lower value
-        self.player.values[get_board_state_tuple("-O-|-X-|---")] = 0.499 # Rotated by 90 degrees
-                                                                         # Reflected on right diagonal
-        self.player.values[get_board_state_tuple("---|OX-|---")] = 0.499 # Rotated by 180 degrees
-                                                                         # Reflected vertically
-        self.player.values[get_board_state_tuple("---|-X-|-O-")] = 0.499 # Rotated by 270 degrees
-                                                                         # Reflected on left diagonal
+        choice_mock.side_effect = MockRandom(2).choice
+
+        # ---|-XO|--- is stored once for all of its symmetries:
+        #                -O-|-X-|--- (Rotated by 90 degrees, Reflected on right diagonal)
+        #                ---|OX-|--- (Rotated by 180 degrees, Reflected vertically)
+        #                ---|-X-|-O- (Rotated by 270 degrees, Reflected on left diagonal)
+        self.player.values[self.get_stored_state("---|-XO|---")] = 0.501
+        self.player.values[self.get_stored_state("O--|-X-|---")] = 0.499
 
         assert_get_move_is(self, self.player, self.board, 5, Board.O, "---|-X-|---")
-        choice_mock.assert_called_once_with([5])
+        choice_mock.assert_called_once_with([1, 3, 5, 7])
 
     @patch('td_learning_player.random.choice')
     @patch('td_learning_player.random.random')
@@ -101,8 +102,8 @@ class TestTDSymmetricLearningPlayer(TestTDLearningPlayer):
         random_mock.return_value = 0.1
         choice_mock.side_effect = MockRandom(1).choice
 
-        self.player.values[get_board_state_tuple("X--|-XO|---")] = 0.501 # position 0
-        self.player.values[get_board_state_tuple("--X|-XO|---")] = 0.501 # position 2
+        self.player.values[self.get_stored_state("X--|-XO|---")] = 0.501 # position 0
+        self.player.values[self.get_stored_state("--X|-XO|---")] = 0.501 # position 2
 
         # Symmetries for X--|-XO|---:
         #                -O-|-X-|X-- (Rotated by 90 degrees)
@@ -0,0 +1,169 @@
+import unittest
+from io import StringIO
+from mock import patch
+from train import Trainer
+from board import Board
+from board_test_utils import get_board_state_key
+
+class TestTrainer(unittest.TestCase):
+    def get_trainer(self, *args):
+        return Trainer(["--num-games", "10", "--num-batches", "2"] + list(args))
+
+    def get_stats(self, x_losses, o_losses):
+        return {"compete_x_vs_random": [{Board.X: 0, Board.O: x_losses, Board.DRAW: 0}],
+                "compete_o_vs_random": [{Board.X: o_losses, Board.O: 0, Board.DRAW: 0}]}
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def assert_train_plays_batches(self, num_batches, converged, trainer, stdout_mock):
+        with patch('train.Trainer._train_batch') as train_mock, \
+             patch('train.Trainer._compete_batch') as compete_mock, \
+             patch('train.Trainer._is_converged') as converged_mock:
+            compete_mock.return_value = {Board.X: 0, Board.O: 0, Board.DRAW: 0}
+            converged_mock.side_effect = converged
+            stats = trainer.train()
+        self.assertEqual(num_batches, len(stats["train_self"]))
+        return stdout_mock.getvalue()
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_closes_parallel_self_play_on_error(self, _):
+        trainer = self.get_trainer("--workers", "2")
+        with patch.object(trainer.parallel, 'close') as close_mock, \
+             patch('train.Trainer._train_batch', side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                trainer.train()
+        close_mock.assert_called_once_with(terminate=True)
+        trainer.parallel.close()
+
+    def test_early_stopping_disabled_without_thresholds(self):
+        trainer = self.get_trainer()
+        self.assertFalse(trainer.early_stopping)
+        self.assert_train_plays_batches(5, [], trainer)
+
+    def test_train_stops_after_patience_converged_batches_in_a_row(self):
+        trainer = self.get_trainer("--max-loss-rate", "0.1", "--patience", "2")
+        output = self.assert_train_plays_batches(4, [True, False, True, True], trainer)
+        self.assertIn("Stopping early after 8 games", output)
+
+    def test_train_plays_all_games_if_not_converged(self):
+        trainer = self.get_trainer("--max-delta", "0.1", "--patience", "2")
+        self.assert_train_plays_batches(5, [True, False, True, False, True], trainer)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_is_converged_checks_loss_rate(self, stdout_mock):
+        trainer = self.get_trainer("--max-loss-rate", "0.5")
+        old_values = trainer._get_values()
+        self.assertTrue(trainer._is_converged(old_values, self.get_stats(1, 0)))
+        self.assertFalse(trainer._is_converged(old_values, self.get_stats(0, 2)))
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_is_converged_checks_value_deltas(self, stdout_mock):
+        trainer = self.get_trainer("--max-delta", "0.1", "--mean-delta", "0.05")
+        trainer.player1.use_dense_values()
+        trainer.player1.values[get_board_state_key("X--|---|---")] = 0.6
+        trainer.player1.values[get_board_state_key("X--|-O-|---")] = 0.5
+        old_values = trainer._get_values()
+        trainer.player1.values[get_board_state_key("X--|---|---")] = 0.65
+        self.assertTrue(trainer._is_converged(old_values, self.get_stats(0, 0)))
+        trainer.player1.values[get_board_state_key("X--|---|---")] = 0.75
+        self.assertFalse(trainer._is_converged(old_values, self.get_stats(0, 0)))
+
+    def test_get_convergence_stats_counts_new_states_from_initial_value(self):
+        trainer = self.get_trainer("--max-delta", "0.1")
+        old_values = trainer._get_values()
+        trainer.player2.values[get_board_state_key("X--|-O-|---")] = 0.2
+        convergence_stats = trainer._get_convergence_stats(old_values, self.get_stats(0, 0))
+        self.assertAlmostEqual(0.3, convergence_stats["max_delta"])
+        self.assertAlmostEqual(0.3, convergence_stats["mean_delta"])
+        self.assertEqual(0.0, convergence_stats["loss_rate"])
+
+    def test_init_player_sets_schedules_over_batches(self):
+        trainer = self.get_trainer("--alpha", "0.2", "--alpha-schedule", "linear", "--final-alpha", "0.1")
+        self.assertEqual({"type": "linear", "final": 0.1, "num_steps": 4},
+                         trainer.player1.get_params()["alpha_schedule"])
+        self.assertEqual("constant", trainer.player1.get_params()["epsilon_schedule"]["type"])
+
+    def test_init_player_sets_schedules_over_games(self):
+        trainer = self.get_trainer(
+            "--epsilon-schedule", "exponential", "--final-epsilon", "0.01", "--schedule-by", "game")
+        self.assertEqual({"type": "exponential", "final": 0.01, "num_steps": 9},
+                         trainer.player2.get_params()["epsilon_schedule"])
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_non_constant_schedule_needs_final_value(self, stderr_mock):
+        self.assertRaises(SystemExit, self.get_trainer, "--alpha-schedule", "harmonic")
+        self.assertIn("--final-alpha is needed", stderr_mock.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_workers_must_be_at_least_one(self, stderr_mock):
+        self.assertRaises(SystemExit, self.get_trainer, "--workers", "0")
+        self.assertIn("--workers must be at least 1", stderr_mock.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_patience_must_be_at_least_one(self, stderr_mock):
+        self.assertRaises(SystemExit, self.get_trainer, "--max-delta", "0.1", "--patience", "0")
+        self.assertIn("--patience must be at least 1", stderr_mock.getvalue())
+
+    @patch('sys.stderr', new_callable=StringIO)
+    def test_vectorized_training_needs_random_opponent(self, stderr_mock):
+        self.assertRaises(SystemExit, self.get_trainer, "--opponent", "Minimax", "--vectorized")
+        self.assertIn("can only play against Perfect or Random opponents", stderr_mock.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_plays_against_opponent(self, stdout_mock):
+        trainer = self.get_trainer("--opponent", "Minimax")
+        stats = trainer.train()
+        self.assertEqual(0, stats["compete_x_vs_random"][-1][Board.X])
+        self.assertIn("Compete O vs. Minimax", stdout_mock.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_vectorized_train_plays_against_perfect_opponent(self, stdout_mock):
+        trainer = self.get_trainer("--opponent", "Perfect", "--vectorized")
+        stats = trainer.train()
+        self.assertEqual(0, stats["compete_x_vs_random"][-1][Board.X])
+        self.assertEqual(0, stats["compete_o_vs_random"][-1][Board.O])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_steps_schedules_once_per_batch(self, stdout_mock):
+        trainer = self.get_trainer("--alpha", "0.2", "--alpha-schedule", "linear", "--final-alpha", "0.1")
+        alphas = []
+        with patch('train.Trainer._train_batch') as train_mock, \
+             patch('train.Trainer._compete_batch') as compete_mock:
+            train_mock.side_effect = lambda *args: alphas.append(trainer.player1.alpha)
+            compete_mock.return_value = {Board.X: 0, Board.O: 0, Board.DRAW: 0}
+            trainer.train()
+        for expected, alpha in zip([0.2, 0.175, 0.15, 0.125, 0.1], alphas[::3]):
+            self.assertAlmostEqual(expected, alpha)
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_steps_schedules_once_per_game(self, stdout_mock):
+        trainer = self.get_trainer(
+            "--epsilon", "0.9", "--epsilon-schedule", "linear", "--final-epsilon", "0.0", "--schedule-by", "game")
+        epsilons = []
+        with patch('train.Trainer._train_game') as train_mock, \
+             patch('train.Trainer._compete_game') as compete_mock:
+            train_mock.side_effect = lambda controller: epsilons.append(trainer.player1.epsilon) or Board.DRAW
+            compete_mock.return_value = Board.DRAW
+            trainer.train()
+        for expected, epsilon in zip([0.9, 0.8], epsilons[:2]):
+            self.assertAlmostEqual(expected, epsilon)
+        self.assertAlmostEqual(0.0, epsilons[-1])
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_adds_visit_stats_if_counting_visits(self, stdout_mock):
+        trainer = self.get_trainer("--count-visits", "--vectorized")
+        stats = trainer.train()
+        self.assertEqual(5, len(stats["visits"]))
+        self.assertGreater(stats["visits"][-1][Board.X]["num_visited"], 0)
+        self.assertIn("- O visits: states=", stdout_mock.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_adds_audit_stats_if_auditing(self, stdout_mock):
+        stats = self.get_trainer("--audit").train()
+        self.assertEqual(5, len(stats["audit"]))
+        self.assertEqual(2423, stats["audit"][-1][Board.X]["num_positions"])
+        self.assertIn("- O audit: suboptimal=", stdout_mock.getvalue())
+
+    @patch('sys.stdout', new_callable=StringIO)
+    def test_train_does_not_add_visit_stats_by_default(self, stdout_mock):
+        trainer = self.get_trainer("--vectorized")
+        self.assertNotIn("visits", trainer.train())
@@ -5,3 +5,8 @@ import utils
 class TestUtils(unittest.TestCase):
     def test_get_path(self):
         self.assertEqual(os.path.abspath("./dir/file"), utils.get_path("dir", "file"))
+
+    def test_split_games_spreads_remainder_over_first_parts(self):
+        self.assertEqual([3, 3, 2], utils.split_games(8, 3))
+        self.assertEqual([3, 2], utils.split_games(5, 2))
+        self.assertEqual([0, 0], utils.split_games(0, 2))
@@ -0,0 +1,97 @@
+import unittest
+import pickle
+import numpy as np
+from mock import patch
+from value_table import ArrayValueTable, SharedValueTable
+from board import Board
+from board_test_utils import get_board_state_key
+
+class TestArrayValueTable(unittest.TestCase):
+    def setUp(self):
+        self.values = ArrayValueTable()
+        self.state1 = get_board_state_key("X--|---|---")
+        self.state2 = get_board_state_key("XO-|---|---")
+
+    def test_constructor_initializes_empty_values(self):
+        self.assertEqual(0, len(self.values))
+        self.assertEqual([], self.values.keys())
+
+    def test_constructor_stores_initial_values(self):
+        values = ArrayValueTable({self.state1: 0.25, self.state2: 0.75})
+        self.assertEqual([(self.state1, 0.25), (self.state2, 0.75)], values.items())
+
+    def test_array_is_dense_float32(self):
+        self.assertEqual((Board.NUM_STATES,), self.values.array.shape)
+        self.assertEqual("float32", self.values.array.dtype.name)
+        self.assertLess(self.values.array.nbytes, 80*1024)
+
+    def test_get_returns_default_if_state_unseen(self):
+        self.assertIsNone(self.values.get(self.state1))
+        self.assertEqual(0.5, self.values.get(self.state1, 0.5))
+
+    def test_get_returns_value_if_state_seen(self):
+        self.values[self.state1] = 0.625
+        self.assertAlmostEqual(0.625, self.values.get(self.state1))
+        self.assertAlmostEqual(0.625, self.values[self.state1])
+
+    def test_getitem_raises_key_error_if_state_unseen(self):
+        with self.assertRaises(KeyError):
+            self.values[self.state1]
+
+    def test_contains(self):
+        self.values[self.state1] = 0.0
+        self.assertIn(self.state1, self.values)
+        self.assertNotIn(self.state2, self.values)
+
+    def test_len_and_keys_count_seen_states(self):
+        self.values[self.state2] = 0.5
+        self.values[self.state1] = 1.0
+        self.assertEqual(2, len(self.values))
+        self.assertEqual(sorted([self.state1, self.state2]), list(self.values))
+
+    def test_copy_keeps_shape(self):
+        values = ArrayValueTable(array=np.zeros((Board.NUM_STATES, 9), dtype=np.float32))
+        self.assertEqual((Board.NUM_STATES, 9), ArrayValueTable(values).array.shape)
+
+class TestSharedValueTable(unittest.TestCase):
+    def setUp(self):
+        self.state = get_board_state_key("X--|---|---")
+        self.values = SharedValueTable({self.state: 0.25})
+
+    def tearDown(self):
+        self.values.unlink()
+
+    def test_constructor_stores_initial_values(self):
+        self.assertEqual([(self.state, 0.25)], self.values.items())
+
+    def test_attached_table_shares_values(self):
+        attached_values = SharedValueTable(name=self.values.get_name())
+        attached_values[self.state] = 0.75
+        self.assertAlmostEqual(0.75, self.values[self.state])
+        attached_values.close()
+
+    def test_pickle_attaches_instead_of_copying(self):
+        attached_values = pickle.loads(pickle.dumps(self.values))
+        self.assertEqual(self.values.get_name(), attached_values.get_name())
+        self.values[self.state] = 0.5
+        self.assertAlmostEqual(0.5, attached_values[self.state])
+        attached_values.close()
+
+    def test_attaching_does_not_register_with_resource_tracker(self):
+        with patch('multiprocessing.resource_tracker.register') as register_mock:
+            attached_values = SharedValueTable(name=self.values.get_name())
+        register_mock.assert_not_called()
+        attached_values.close()
+
+    def test_array_value_table_copies_shared_values(self):
+        values = ArrayValueTable(self.values)
+        self.values[self.state] = 0.5
+        self.assertEqual([(self.state, 0.25)], values.items())
+
+    def test_pickle_keeps_shape(self):
+        values = SharedValueTable(ArrayValueTable(array=np.zeros((Board.NUM_STATES, 9), dtype=np.float32)))
+        attached_values = pickle.loads(pickle.dumps(values))
+        attached_values.array[1, 2] = 0.5
+        self.assertEqual(0.5, values.array[1, 2])
+        attached_values.close()
+        values.unlink()
@@ -7,19 +7,22 @@ from game_controller import GameController
 from human_player import HumanPlayer
 from random_player import RandomPlayer
 from td_learning_player import TDLearningPlayer
+from value_table import ArrayValueTable
 
 class TestWebGame(unittest.TestCase):
     def setUp(self):
         self.game = WebGame()
 
-    def set_loaded(self, piece):
+    def set_loaded(self, piece, shared):
+        self.assertTrue(shared)
         self.loaded[piece] = True
+        return {"values": ArrayValueTable().array}
 
     @patch('learning_computer_player.LearningComputerPlayer._load_file')
     def assert_start_game_does(
             self, load_mock, player_types_dict, player1_class, player2_class,
             expected_player1_loaded=False, expected_player2_loaded=False):
-        load_mock.side_effect = lambda piece: self.set_loaded(piece)
+        load_mock.side_effect = lambda piece, shared: self.set_loaded(piece, shared)
         self.loaded = {Board.X: False, Board.O: False}
 
         self.assert_game_info_is(None, [], Board.X, "---|---|---", self.game.start_game(player_types_dict))
@@ -101,6 +104,16 @@ class TestWebGame(unittest.TestCase):
             expected_player1_loaded=False,
             expected_player2_loaded=True)
 
+    @patch('random_player.RandomPlayer.get_move')
+    def test_start_game_reuses_controller_if_same_player_types(self, get_move_mock):
+        get_move_mock.return_value = 4
+        self.game.start_game({"x": "Random", "o": "Random"})
+        controller = self.game.controller
+        self.game.make_computer_move()
+        game_info = self.game.start_game({"x": "Random", "o": "Random"})
+        self.assert_game_info_is(None, [], Board.X, "---|---|---", game_info)
+        self.assertIs(controller, self.game.controller)
+
     @patch('random_player.RandomPlayer.get_move')
     def test_make_computer_move(self, get_move_mock):
         get_move_mock.return_value = 4